@@ -7,6 +7,7 @@ from os import environ
 from flask import Flask, jsonify
 from flask_cors import CORS
 from models import storage
+from api.v1.compression import compress
 from api.v1.views import app_views
 
 app = Flask(__name__)
@@ -16,6 +17,8 @@ cors = CORS(app, resources={"/*": {"origins": "0.0.0.0:"}})
 
 app.register_blueprint(app_views)
 app.url_map.strict_slashes = False
+# compress the large responses for the clients that accept it
+app.after_request(compress)
 
 
 @app.teardown_appcontext
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+'''In-process cache of the API responses that list objects.'''
+
+from collections import OrderedDict
+from os import getenv
+import threading
+from time import monotonic
+from flask import Response, request
+
+# most responses kept, the least recently used go first; 0 keeps none
+CACHE_SIZE = int(getenv('HBNB_API_CACHE_SIZE', 256))
+# seconds a response is kept at most, 0 for as long as its ETag holds
+CACHE_TTL = float(getenv('HBNB_API_CACHE_TTL', 60))
+
+
+class ResponseCache:
+    """
+    Least recently used responses, by route and arguments, each kept with
+    the ETag it was made for: the storage generations of the classes it
+    lists. An entry whose ETag is no longer the current one is stale.
+    """
+
+    def __init__(self):
+        """Initializes an empty cache"""
+        # key -> (etag, expiry time or None, (status, headers, body))
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key():
+        """Returns the key of the current request: its endpoint, view
+        arguments and query string arguments"""
+        return (request.endpoint,
+                tuple(sorted(request.view_args.items())),
+                tuple(sorted(request.args.items(multi=True))))
+
+    def get(self, key, etag):
+        """Returns a copy of the response kept under key for etag, or None
+        if there is none or it expired"""
+        if CACHE_SIZE <= 0:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if (entry is not None and entry[0] == etag and
+                    (entry[1] is None or monotonic() < entry[1])):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                status, headers, body = entry[2]
+                return Response(body, status, headers)
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, etag, response):
+        """Keeps response under key for etag, if it can be replayed"""
+        if CACHE_SIZE <= 0 or response.is_streamed:
+            return
+        headers = [(name, value) for name, value in response.headers
+                   if name != 'Content-Length']
+        expiry = monotonic() + CACHE_TTL if CACHE_TTL > 0 else None
+        entry = (etag, expiry,
+                 (response.status_code, headers, response.get_data()))
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forgets every response and resets the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns the hit and miss counters and the number of entries"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self.entries), "size": CACHE_SIZE,
+                    "ttl": CACHE_TTL}
+
+
+# the cache of the responses of the conditional views
+responses = ResponseCache()
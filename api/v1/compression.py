@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+'''Negotiated gzip and brotli compression of the API responses.'''
+
+from collections import OrderedDict
+import gzip
+import hashlib
+from os import getenv
+import threading
+from flask import request
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# responses smaller than this many bytes are sent as they are
+MIN_SIZE = int(getenv('HBNB_API_COMPRESS_MIN_SIZE', 1024))
+# gzip level, from 1 (fastest) to 9 (smallest)
+GZIP_LEVEL = int(getenv('HBNB_API_GZIP_LEVEL', 6))
+# brotli quality, from 0 (fastest) to 11 (smallest)
+BROTLI_LEVEL = int(getenv('HBNB_API_BROTLI_LEVEL', 4))
+# number of compressed bodies kept to be sent again without compressing
+# them, 0 to keep none
+CACHE_SIZE = int(getenv('HBNB_API_COMPRESS_CACHE', 128))
+# mimetypes worth compressing
+COMPRESSIBLE = ('application/json', 'text/html', 'text/plain')
+
+
+def gzip_body(data):
+    '''Returns data compressed with gzip.'''
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def brotli_body(data):
+    '''Returns data compressed with brotli.'''
+    return brotli.compress(data, quality=BROTLI_LEVEL)
+
+
+# Content-Encoding -> function compressing a body, in order of preference
+encoders = OrderedDict()
+if brotli is not None:
+    encoders['br'] = brotli_body
+encoders['gzip'] = gzip_body
+
+# (digest of the body, encoding) -> compressed body, least recently used
+# first
+_bodies = OrderedDict()
+_bodies_lock = threading.Lock()
+
+
+def choose_encoding():
+    '''
+    Returns the encoding of encoders the client prefers, by the quality
+    of its Accept-Encoding, or None if it accepts none of them.
+    '''
+    best, best_quality = None, 0
+    for encoding in encoders:
+        quality = request.accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressed(data, encoding):
+    '''
+    Returns data compressed with encoding, reusing the compressed body of
+    an identical response sent recently.
+    '''
+    if CACHE_SIZE <= 0:
+        return encoders[encoding](data)
+    key = (hashlib.sha1(data).digest(), encoding)
+    with _bodies_lock:
+        body = _bodies.get(key)
+        if body is not None:
+            _bodies.move_to_end(key)
+            return body
+    body = encoders[encoding](data)
+    with _bodies_lock:
+        _bodies[key] = body
+        while len(_bodies) > CACHE_SIZE:
+            _bodies.popitem(last=False)
+    return body
+
+
+def compress(response):
+    '''
+    Compresses the body of response with the encoding the client prefers,
+    if it is at least MIN_SIZE bytes of a compressible type, and returns
+    it; registered to run after each request.
+
+    A compressed response gets a weak ETag, since its bytes differ from
+    the uncompressed ones, which still matches its If-None-Match.
+    '''
+    if (response.status_code != 200 or response.direct_passthrough or
+            response.is_streamed or
+            'Content-Encoding' in response.headers or
+            response.mimetype not in COMPRESSIBLE):
+        return response
+    data = response.get_data()
+    if len(data) < MIN_SIZE:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+    response.set_data(compressed(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
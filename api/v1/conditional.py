@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+'''Conditional GET for the API: ETag, Last-Modified and Cache-Control.'''
+
+from functools import wraps
+import hashlib
+from os import getenv
+from flask import Response, jsonify, make_response, request
+from werkzeug.http import is_resource_modified
+from api.v1.cache import responses
+from models import storage
+
+# seconds that clients and shared caches may reuse a response for before
+# asking again, with its ETag, whether it changed
+MAX_AGE = int(getenv('HBNB_API_MAX_AGE', 0))
+
+
+def cache_headers(response):
+    '''
+    Sets the Cache-Control header of response and returns it.
+    '''
+    response.cache_control.public = True
+    response.cache_control.max_age = MAX_AGE
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    '''
+    Returns an empty 304 Not Modified response for etag.
+    '''
+    response = Response(status=304)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return cache_headers(response)
+
+
+def conditional(*classes):
+    '''
+    Decorates a GET view that lists objects of classes, so that it answers
+    304 Not Modified, without running, to a client whose If-None-Match
+    holds the ETag of its last response, as long as no object of classes
+    was added, changed or deleted since.
+
+    The ETag is made of the storage.generation() of each class, read
+    before the view reads the objects. A response is only tagged when its
+    status is 200, and is then kept in the response cache, that replays
+    it for the same arguments as long as its ETag holds.
+    '''
+    def decorator(view):
+        '''Returns the conditional view.'''
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            '''Runs view if neither the client nor the cache has its
+            response.'''
+            generations = '\n'.join(storage.generation(cls)
+                                    for cls in classes)
+            etag = hashlib.sha1(generations.encode()).hexdigest()
+            if not is_resource_modified(request.environ, etag=etag):
+                return not_modified(etag)
+            key = responses.key()
+            response = responses.get(key, etag)
+            if response is not None:
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                cache_headers(response)
+                responses.put(key, etag, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def object_response(obj):
+    '''
+    Returns obj as JSON with an ETag made of a hash of that JSON, and its
+    updated_at as Last-Modified; or 304 Not Modified when the client's
+    If-None-Match or If-Modified-Since shows that it has it already.
+    updated_at is only precise to the second on MySQL, so the ETag hashes
+    what is sent rather than when it last changed.
+    '''
+    response = jsonify(obj.to_dict())
+    etag = hashlib.sha1(response.get_data()).hexdigest()
+    if not is_resource_modified(request.environ, etag=etag,
+                                last_modified=obj.updated_at):
+        return not_modified(etag, obj.updated_at)
+    response.set_etag(etag)
+    response.last_modified = obj.updated_at
+    return cache_headers(response)
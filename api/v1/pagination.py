@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+'''Paginated and streamed responses for the list endpoints of the API.'''
+
+from os import getenv
+from flask import Response, abort, json, jsonify, request
+from flask import stream_with_context, url_for
+from models import storage
+
+# largest page a client can get, also the page size when it asks for none
+MAX_PAGE_SIZE = int(getenv('HBNB_API_MAX_PAGE_SIZE', 1000))
+# number of objects encoded into each chunk of a streamed response
+STREAM_CHUNK_SIZE = 100
+
+
+def page_args():
+    '''
+    Returns the (limit, after) pair asked for in the query string.
+    '''
+    try:
+        limit = int(request.args.get('limit', MAX_PAGE_SIZE))
+    except ValueError:
+        abort(400, 'Invalid limit')
+    if limit < 1:
+        abort(400, 'Invalid limit')
+    return min(limit, MAX_PAGE_SIZE), request.args.get('after')
+
+
+def stream(cls, **filters):
+    '''
+    Returns every cls object matching filters, ordered by id, as a JSON
+    list that is encoded and sent a chunk at a time while storage
+    iterates over them.
+    '''
+    def generate():
+        '''Yields the JSON list in chunks of STREAM_CHUNK_SIZE objects.'''
+        sep = '['
+        chunk = []
+        for obj in storage.iterate(cls, **filters):
+            chunk.append(sep + json.dumps(obj.to_dict()))
+            sep = ','
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield ''.join(chunk)
+                chunk = []
+        yield ''.join(chunk) + ('[]' if sep == '[' else ']')
+
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
+
+
+def paginate(cls, **filters):
+    '''
+    Returns a JSON list of the cls objects matching filters, ordered by id.
+
+    The page holds at most `limit` objects whose id sorts after `after`,
+    both read from the query string. When more objects follow, the
+    response carries a `Link: <...>; rel="next"` header to the next page.
+    With `stream=1` in the query string the whole list is streamed
+    instead, see stream().
+    '''
+    if request.args.get('stream') in ('1', 'true'):
+        return stream(cls, **filters)
+    limit, after = page_args()
+    return page_response(storage.page(cls, limit + 1, after, **filters),
+                         limit)
+
+
+def page_response(objs, limit):
+    '''
+    Returns the first limit objects of objs as a JSON list. objs is
+    fetched with limit + 1 objects, so that a Link header to the next page
+    is only added when one more object follows.
+    '''
+    response = jsonify([obj.to_dict() for obj in objs[:limit]])
+    if len(objs) > limit:
+        args = dict(request.view_args, limit=limit, after=objs[limit - 1].id)
+        response.headers['Link'] = '<{}>; rel="next"'.format(
+            url_for(request.endpoint, **args))
+    return response
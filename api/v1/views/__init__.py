@@ -14,3 +14,4 @@ from api.v1.views.users import *
 from api.v1.views.places import *
 from api.v1.views.places_amenities import *
 from api.v1.views.places_reviews import *
+from api.v1.views.batch import *
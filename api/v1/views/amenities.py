@@ -4,18 +4,17 @@
 from flask import abort, jsonify, request
 from models.amenity import Amenity
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/amenities', methods=['GET'],
                  strict_slashes=False)
+@conditional(Amenity)
 def get_all_amenities():
-    """Get all amenities objects from the storage."""
-    amenities = storage.all(Amenity).values()
-    """Convert the object to dict and JSON."""
-    amenities_list = [amenity.to_dict() for amenity in amenities]
-
-    return jsonify(amenities_list)
+    """Get a page of amenities objects from the storage."""
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenities_id>', methods=['GET'],
@@ -25,7 +24,7 @@ def get_single_amenities(amenities_id):
     amenities = storage.get(Amenity, amenities_id)
     """Return the amenities object in JSON otherwise 404 error."""
     if amenities:
-        return jsonify(amenities.to_dict())
+        return object_response(amenities)
     else:
         abort(404)
 
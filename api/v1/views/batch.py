@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+"""Batch of creates, updates and deletes written with a single save."""
+
+from datetime import datetime
+from flask import abort, jsonify, request
+from os import getenv
+from api.v1.views import app_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# largest number of operations in one batch
+MAX_BATCH = int(getenv('HBNB_API_MAX_BATCH', 10000))
+
+# class name -> (class, attributes a create requires, (attribute, class)
+# pairs of the objects it must refer to), as checked by the POST routes
+CREATE_RULES = {
+    'Amenity': (Amenity, ('name',), ()),
+    'City': (City, ('state_id', 'name'), (('state_id', State),)),
+    'Place': (Place, ('city_id', 'user_id', 'name'),
+              (('city_id', City), ('user_id', User))),
+    'Review': (Review, ('place_id', 'user_id', 'text'),
+               (('place_id', Place), ('user_id', User))),
+    'State': (State, ('name',), ()),
+    'User': (User, ('email', 'password'), ()),
+}
+
+# class name -> attributes an update leaves alone, as the PUT routes do
+UPDATE_IGNORED = {
+    'Amenity': ('id', 'created_at', 'updated_at'),
+    'City': ('id', 'state_id', 'created_at', 'updated_at'),
+    'Place': ('id', 'user_id', 'city_id', 'created_at', 'updated_at'),
+    'Review': ('id', 'user_id', 'place_id', 'created_at', 'updated_at'),
+    'State': ('id', 'created_at', 'updated_at'),
+    'User': ('id', 'email', 'created_at', 'updated_at'),
+}
+
+
+class Batch:
+    """The objects a batch created, changed and looked up so far"""
+
+    def __init__(self):
+        """Starts an empty batch."""
+        # "<class name>.<id>" -> object, or None when it does not exist
+        self.objects = {}
+        # key -> object created by the batch, in creation order
+        self.created = {}
+        self.changed = False
+
+    def find(self, cls, obj_id):
+        """Returns the cls object obj_id, created by the batch or stored,
+        None if there is none."""
+        key = '{}.{}'.format(cls.__name__, obj_id)
+        if key not in self.objects:
+            self.objects[key] = (storage.get(cls, obj_id)
+                                 if isinstance(obj_id, str) else None)
+        return self.objects[key]
+
+    def create(self, name, data):
+        """Creates a name object from data, see the POST routes."""
+        if not isinstance(data, dict):
+            return 400, 'Not a JSON'
+        cls, required, parents = CREATE_RULES[name]
+        for attr, parent in parents:
+            if attr in data and self.find(parent, data[attr]) is None:
+                return 404, 'Not found'
+        for attr in required:
+            if attr not in data:
+                return 400, 'Missing {}'.format(attr)
+        obj = cls(**data)
+        key = '{}.{}'.format(name, obj.id)
+        if self.find(cls, obj.id) is not None:
+            return 400, 'Duplicate id'
+        self.objects[key] = self.created[key] = obj
+        return 201, obj
+
+    def update(self, name, obj_id, data):
+        """Updates the name object obj_id with data, see the PUT routes."""
+        obj = self.find(CREATE_RULES[name][0], obj_id)
+        if obj is None:
+            return 404, 'Not found'
+        if not isinstance(data, dict):
+            return 400, 'Not a JSON'
+        for key, value in data.items():
+            if key not in UPDATE_IGNORED[name]:
+                setattr(obj, key, value)
+        obj.updated_at = datetime.utcnow()
+        if '{}.{}'.format(name, obj_id) not in self.created:
+            storage.new(obj)
+            self.changed = True
+        return 200, obj
+
+    def delete(self, name, obj_id):
+        """Deletes the name object obj_id."""
+        obj = self.find(CREATE_RULES[name][0], obj_id)
+        if obj is None:
+            return 404, 'Not found'
+        key = '{}.{}'.format(name, obj_id)
+        self.objects[key] = None
+        if self.created.pop(key, None) is None:
+            storage.delete(obj)
+            self.changed = True
+        return 200, None
+
+    def apply(self, op):
+        """Runs the operation op, returns its (status, object or error)."""
+        if not isinstance(op, dict) or op.get('class') not in CREATE_RULES:
+            return 400, 'Unknown class'
+        if op.get('op') == 'create':
+            return self.create(op['class'], op.get('data'))
+        if op.get('op') == 'update':
+            return self.update(op['class'], op.get('id'), op.get('data'))
+        if op.get('op') == 'delete':
+            return self.delete(op['class'], op.get('id'))
+        return 400, 'Unknown op'
+
+    def save(self):
+        """Writes every change of the batch with one storage save."""
+        if self.created:
+            storage.bulk_new(list(self.created.values()))
+        if self.created or self.changed:
+            storage.save()
+
+
+@app_views.route('/batch', methods=['POST'], strict_slashes=False)
+def batch():
+    '''
+    Runs a list of operations and saves their changes at once.
+
+    The JSON body is a list of operations, each one of
+    {"op": "create", "class": <name>, "data": {...}},
+    {"op": "update", "class": <name>, "id": <id>, "data": {...}} or
+    {"op": "delete", "class": <name>, "id": <id>}, checked like the
+    matching POST, PUT and DELETE routes. An operation may refer to an
+    object created earlier in the batch. The response lists, in order,
+    {"status": <code>} with the "object" created or updated, or the
+    "error" of the operations that failed, which change nothing.
+    '''
+    ops = request.get_json(silent=True)
+    if not isinstance(ops, list):
+        abort(400, 'Not a JSON')
+    if len(ops) > MAX_BATCH:
+        abort(400, 'Too many operations')
+    work = Batch()
+    # an unexpected error leaves the storage as it was before the batch
+    with storage.batch():
+        outcomes = [work.apply(op) for op in ops]
+        work.save()
+    results = []
+    for status, outcome in outcomes:
+        result = {'status': status}
+        if isinstance(outcome, str):
+            result['error'] = outcome
+        elif outcome is not None:
+            result['object'] = outcome.to_dict()
+        results.append(result)
+    return jsonify(results)
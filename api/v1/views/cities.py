@@ -5,18 +5,20 @@ from flask import abort, jsonify, request
 from models.state import State
 from models.city import City
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@conditional(State, City)
 def get_all_cities(state_id):
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return paginate(City, state_id=state_id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'],
@@ -26,7 +28,7 @@ def get_city(city_id):
     if city is None:
         abort(404)
 
-    return jsonify(city.to_dict())
+    return object_response(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'])
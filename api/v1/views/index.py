@@ -1,8 +1,15 @@
 #!/usr/bin/python3
 """Views for Airbnb Api."""
-from flask import jsonify
+from flask import abort, jsonify
+from os import getenv
+from time import monotonic
+from api.v1.cache import responses
 from api.v1.views import app_views
-from models import storage
+from models import storage, storage_t
+
+# seconds a /stats response is reused before counting again (0 disables)
+_stats_ttl = float(getenv('HBNB_API_STATS_TTL', 0))
+_stats_cache = {'stats': None, 'expires': 0}
 
 
 # Create route /status on the object app_views
@@ -17,15 +24,37 @@ def get_stats():
     """
     Retrieves the number of each objects by type.
     """
-    stats = {
-        'amenities': storage.count('Amenity'),
-        'cities': storage.count('City'),
-        'places': storage.count('Place'),
-        'reviews': storage.count('Review'),
-        'states': storage.count('State'),
-        'users': storage.count('User')
-    }
-    return jsonify(stats)
+    now = monotonic()
+    if _stats_cache['stats'] is None or now >= _stats_cache['expires']:
+        _stats_cache['stats'] = {
+            'amenities': storage.count('Amenity'),
+            'cities': storage.count('City'),
+            'places': storage.count('Place'),
+            'reviews': storage.count('Review'),
+            'states': storage.count('State'),
+            'users': storage.count('User')
+        }
+        _stats_cache['expires'] = now + _stats_ttl
+    return jsonify(_stats_cache['stats'])
+
+
+@app_views.route('/stats/cache', methods=['GET'], strict_slashes=False)
+def get_cache_stats():
+    """
+    Retrieves the hit and miss counters of the response cache.
+    """
+    return jsonify(responses.stats())
+
+
+@app_views.route('/stats/pool', methods=['GET'], strict_slashes=False)
+def get_pool_stats():
+    """
+    Retrieves the size, usage and checkout wait times of the database
+    connection pool; file storage has no pool.
+    """
+    if storage_t != 'db':
+        abort(404)
+    return jsonify(storage.pool_stats())
 
 
 if __name__ == "__main__":
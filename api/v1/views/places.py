@@ -6,20 +6,20 @@ from models.place import Place
 from models.city import City
 from models.user import User
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import page_args, page_response, paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@conditional(City, Place)
 def get_all_places(city_id):
     ''' Get all places in the specified city'''
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
-    places = []
-    for place in city.places:
-        places.append(place.to_dict())
-    return jsonify(places)
+    return paginate(Place, city_id=city_id)
 
 
 @app_views.route('/places/<string:place_id>', methods=['GET'],
@@ -30,7 +30,7 @@ def get_single_place(place_id):
     if place is None:
         abort(404)
 
-    return jsonify(place.to_dict())
+    return object_response(place)
 
 
 @app_views.route('/places/<string:place_id>', methods=['DELETE'])
@@ -95,6 +95,37 @@ def update_place(place_id):
     return jsonify(place.to_dict()), 200
 
 
+@app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def places_search():
+    ''' Search places by states, cities and amenities
+
+    The JSON body may hold lists of ids under "states", "cities" and
+    "amenities". A place matches when it is in one of the cities, or in a
+    city of one of the states (any city when both lists are empty), and
+    has every listed amenity. A list that is not made of id strings is a
+    400 Bad Request.
+
+    Results are paginated like the list routes, but the URL in the Link
+    header, that holds the limit and the after cursor of the next page,
+    only answers a POST: the client sends the same body to it again.
+    '''
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, 'Not a JSON')
+
+    filters = {}
+    for key in ('states', 'cities', 'amenities'):
+        ids = data.get(key) or []
+        if (not isinstance(ids, list) or
+                not all(isinstance(value, str) for value in ids)):
+            abort(400, 'Not a list of ids')
+        filters[key] = ids
+
+    limit, after = page_args()
+    places = storage.search_places(limit=limit + 1, after=after, **filters)
+    return page_response(places, limit)
+
+
 """Error Handlers."""
 
 
@@ -3,13 +3,15 @@
 handles all default RESTFul API actions: '''
 
 from flask import Flask, jsonify, abort
-from models import storage
+from models import storage, storage_t
 from models.place import Place
 from models.amenity import Amenity
+from api.v1.conditional import conditional
 from api.v1.views import app_views
 
 
 @app_views.route('/places/<place_id>/amenities', methods=['GET'])
+@conditional(Place, Amenity)
 def get_place_amenities(place_id):
     place = storage.get(Place, place_id)
     if not place:
@@ -33,8 +35,13 @@ def delete_place_amenity(place_id, amenity_id):
     if amenity not in place.amenities:
         abort(404)
 
-    place.amenities.remove(amenity)
-    storage.save()
+    if storage_t == 'db':
+        place.amenities.remove(amenity)
+        place.save()
+    else:
+        place.amenity_ids = [amenity_id for amenity_id in place.amenity_ids
+                             if amenity_id != amenity.id]
+        place.save()
     return jsonify({}), 200
 
 
@@ -51,8 +58,12 @@ def link_place_amenity(place_id, amenity_id):
     if amenity in place.amenities:
         return jsonify(amenity.to_dict()), 200
 
-    place.amenities.append(amenity)
-    storage.save()
+    if storage_t == 'db':
+        place.amenities.append(amenity)
+        place.save()
+    else:
+        place.amenity_ids = place.amenity_ids + [amenity.id]
+        place.save()
     return jsonify(amenity.to_dict()), 201
 
 
@@ -5,6 +5,8 @@ default RESTFul API actions'''
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import paginate
 from models.review import Review
 from models.place import Place
 from models.user import User
@@ -12,15 +14,13 @@ from models.user import User
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@conditional(Place, Review)
 def get_reviews_by_place(place_id):
     ''' Return a list of reviews for the given place_id.'''
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    reviews_list = []
-    for review in place.reviews:
-        reviews_list.append(review.to_dict())
-    return jsonify(reviews_list)
+    return paginate(Review, place_id=place_id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'],
@@ -31,7 +31,7 @@ def get_single_review(review_id):
     if review is None:
         abort(404)
 
-    return jsonify(review.to_dict())
+    return object_response(review)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'])
@@ -4,17 +4,16 @@
 from flask import abort, jsonify, request
 from models.state import State
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@conditional(State)
 def get_all_states():
-    """Get all states objects from the storage."""
-    states = storage.all(State).values()
-    """Convert the object to dict and JSON."""
-    state_list = [state.to_dict() for state in states]
-
-    return jsonify(state_list)
+    """Get a page of states objects from the storage."""
+    return paginate(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -23,7 +22,7 @@ def get_state(state_id):
     state = storage.get(State, state_id)
     """Return the state object in JSON otherwise 404 error."""
     if state:
-        return jsonify(state.to_dict())
+        return object_response(state)
     else:
         abort(404)
 
@@ -4,15 +4,16 @@
 from flask import abort, jsonify, request
 from models.user import User
 from models import storage
+from api.v1.conditional import conditional, object_response
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@conditional(User)
 def get_all_users():
-    """Get all user objects from the storage."""
-    users = storage.all(User).values()
-    user_list = [user.to_dict() for user in users]
-    return jsonify(user_list)
+    """Get a page of user objects from the storage."""
+    return paginate(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -20,7 +21,7 @@ def get_user(user_id):
     """Get the user object with the given id from storage."""
     user = storage.get(User, user_id)
     if user:
-        return jsonify(user.to_dict())
+        return object_response(user)
     else:
         abort(404)
 
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Times importing places through the API, one POST /cities/<id>/places per
+place and in one POST /batch
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_api_batch
+Each place posted alone saves the whole store, the batch saves it once.
+"""
+
+import os
+import tempfile
+import time
+from api.v1.app import app
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.user import User
+
+SIZES = [100, 1000]
+
+
+def setup():
+    """returns the ids of a new city and user to post places for"""
+    FileStorage._FileStorage__objects = {}
+    state = State(name="North")
+    state.save()
+    city = City(name="Kano", state_id=state.id)
+    city.save()
+    user = User(email="a@b.c", password="pwd")
+    user.save()
+    return city.id, user.id
+
+
+def bench_single(client, size):
+    """returns the seconds taken by posting size places one by one"""
+    city_id, user_id = setup()
+    start = time.perf_counter()
+    for i in range(size):
+        client.post('/api/v1/cities/{}/places'.format(city_id),
+                    json={"name": "place {}".format(i), "user_id": user_id})
+    return time.perf_counter() - start
+
+
+def bench_batch(client, size):
+    """returns the seconds taken by posting size places in one batch"""
+    city_id, user_id = setup()
+    ops = [{"op": "create", "class": "Place",
+            "data": {"name": "place {}".format(i), "city_id": city_id,
+                     "user_id": user_id}} for i in range(size)]
+    start = time.perf_counter()
+    client.post('/api/v1/batch', json=ops)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    client = app.test_client()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{:>10}  {:>12}  {:>12}".format("places", "single (s)",
+                                              "batch (s)"))
+        for size in SIZES:
+            print("{:>10}  {:>12.3f}  {:>12.3f}".format(
+                size, bench_single(client, size), bench_batch(client, size)))
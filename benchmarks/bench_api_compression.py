@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Measures the size and the time of a page of 1000 users sent by the API,
+uncompressed, gzipped and, when the module is installed, brotli'd
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_api_compression
+The compressed bodies kept for identical responses are disabled, so that
+each request compresses its body.
+"""
+
+import os
+import tempfile
+import time
+from api.v1 import compression
+from api.v1.app import app
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+SIZE = 1000
+ROUNDS = 20
+
+
+def bench(client, encoding):
+    """returns the body size and the seconds per request for encoding"""
+    headers = {'Accept-Encoding': encoding}
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        resp = client.get('/api/v1/users', headers=headers)
+    return len(resp.data), (time.perf_counter() - start) / ROUNDS
+
+
+if __name__ == "__main__":
+    compression.CACHE_SIZE = 0
+    client = app.test_client()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        for i in range(SIZE):
+            storage.new(User(email="user{}@hbnb.io".format(i),
+                             password="pwd", first_name="First",
+                             last_name="Last"))
+        storage.save()
+        print("{:>10}  {:>10}  {:>10}".format("encoding", "bytes", "ms/req"))
+        for encoding in ['identity', 'gzip'] + (['br'] if compression.brotli
+                                                else []):
+            size, seconds = bench(client, encoding)
+            print("{:>10}  {:>10}  {:>10.2f}".format(encoding, size,
+                                                     seconds * 1000))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Compares the peak memory of a full /api/v1/users export built as one
+jsonify() payload with the same export streamed by ?stream=1
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_api_list_memory
+The streamed peak should stay flat as the number of users grows.
+"""
+
+import tracemalloc
+from flask import jsonify
+from api.v1.app import app
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+SIZES = [10000, 50000, 100000]
+
+
+def peak(fn):
+    """returns the peak memory in MiB allocated while fn runs"""
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def full_list():
+    """the pre-streaming list view: every dict, then one JSON payload"""
+    with app.test_request_context('/api/v1/users'):
+        users = storage.all(User).values()
+        jsonify([user.to_dict() for user in users]).get_data()
+
+
+def streamed():
+    """reads the streamed response chunk by chunk without keeping it"""
+    with app.test_client() as client:
+        resp = client.get('/api/v1/users?stream=1', buffered=False)
+        for chunk in resp.response:
+            pass
+        resp.close()
+
+
+if __name__ == "__main__":
+    print("{:>10}  {:>14}  {:>14}".format("users", "MiB (full)",
+                                          "MiB (stream)"))
+    for size in SIZES:
+        FileStorage._FileStorage__objects = {}
+        for i in range(size):
+            storage.new(User(email="{}@hbnb.io".format(i), password="pwd"))
+        print("{:>10}  {:>14.1f}  {:>14.1f}".format(size, peak(full_list),
+                                                    peak(streamed)))
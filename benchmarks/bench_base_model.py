@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Compares BaseModel construction from dicts (what FileStorage.reload does)
+and to_dict() (what save() and every list endpoint do) at 100k objects
+with the strptime()/strftime() code they replaced
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_base_model
+"""
+
+from datetime import datetime
+import time
+from models.base_model import time as t_format
+from models.place import Place
+
+COUNT = 100000
+
+
+def legacy_init(self, **kwargs):
+    """BaseModel.__init__ as it was, parsing with strptime()"""
+    for key, value in kwargs.items():
+        if key != "__class__":
+            setattr(self, key, value)
+    self.created_at = datetime.strptime(kwargs["created_at"], t_format)
+    self.updated_at = datetime.strptime(kwargs["updated_at"], t_format)
+
+
+def legacy_to_dict(self):
+    """BaseModel.to_dict as it was, formatting with strftime()"""
+    new_dict = self.__dict__.copy()
+    new_dict["created_at"] = new_dict["created_at"].strftime(t_format)
+    new_dict["updated_at"] = new_dict["updated_at"].strftime(t_format)
+    new_dict["__class__"] = self.__class__.__name__
+    return new_dict
+
+
+def timed(fn):
+    """returns the objects per second fn gets through on COUNT objects"""
+    start = time.perf_counter()
+    fn()
+    return COUNT / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    dicts = [Place(name="place {}".format(i), city_id="c", user_id="u",
+                   number_rooms=i % 5).to_dict() for i in range(COUNT)]
+    legacy = []
+    current = []
+
+    def legacy_reload():
+        """builds the places the old way"""
+        for d in dicts:
+            obj = Place.__new__(Place)
+            legacy_init(obj, **d)
+            legacy.append(obj)
+
+    def current_reload():
+        """builds the places the way FileStorage.reload does"""
+        for d in dicts:
+            current.append(Place(**d))
+
+    print("{:<28}  {:>12}  {:>12}".format("objects/second", "before",
+                                          "after"))
+    print("{:<28}  {:>12.0f}  {:>12.0f}".format(
+        "reload", timed(legacy_reload), timed(current_reload)))
+    print("{:<28}  {:>12.0f}  {:>12.0f}".format(
+        "to_dict, first call",
+        timed(lambda: [legacy_to_dict(obj) for obj in legacy]),
+        timed(lambda: [obj.to_dict() for obj in current])))
+    print("{:<28}  {:>12.0f}  {:>12.0f}".format(
+        "to_dict, unchanged objects",
+        timed(lambda: [legacy_to_dict(obj) for obj in legacy]),
+        timed(lambda: [obj.to_dict() for obj in current])))
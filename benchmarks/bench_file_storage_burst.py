@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""
+Times a burst of saves on FileStorage, written one by one and grouped by
+HBNB_FILE_SAVE_DELAY
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_burst
+Each save() rewrites the whole file, atomically and fsync'ed, unless it
+waits for the delayed write of the burst.
+"""
+
+import os
+import tempfile
+import time
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+SIZE = 10000
+BURST = 50
+
+
+def bench(delay):
+    """returns the seconds taken by BURST saves and their final write"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__save_delay = 0
+    storage = FileStorage()
+    for i in range(SIZE):
+        storage.new(Place(name="place {}".format(i)))
+    storage.save()
+    FileStorage._FileStorage__save_delay = delay
+    start = time.perf_counter()
+    for i in range(BURST):
+        Place(name="new place {}".format(i)).save()
+    storage.flush()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{} saves on {} objects".format(BURST, SIZE))
+        print("{:>9}  {:>9}".format("delay (s)", "total (s)"))
+        for delay in (0, 0.05):
+            print("{:>9}  {:>9.3f}".format(delay, bench(delay)))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Times FileStorage.save and reload of a large store with each codec
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_codec
+Only the codecs whose module is installed are timed.
+"""
+
+import os
+import tempfile
+import time
+from models.engine import codec
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+SIZE = 100000
+
+
+def bench(name):
+    """returns the seconds taken by save() and by reload(), and the size of
+    the file, with the codec called name"""
+    FileStorage._FileStorage__codec = codec.get(name)
+    storage = FileStorage()
+    start = time.perf_counter()
+    storage.save()
+    saved = time.perf_counter() - start
+    objects = FileStorage._FileStorage__objects
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.reload()
+    reloaded = time.perf_counter() - start
+    FileStorage._FileStorage__objects = objects
+    path = FileStorage._FileStorage__file_path
+    return saved, reloaded, os.path.getsize(path)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        for i in range(SIZE):
+            storage.new(Place(name="place {}".format(i), city_id="city",
+                              user_id="user", description="A place to stay",
+                              number_rooms=i % 5, latitude=37.7,
+                              amenity_ids=["wifi", "pool"]))
+        print("{} objects".format(SIZE))
+        print("{:>8}  {:>9}  {:>11}  {:>9}".format("codec", "save (s)",
+                                                   "reload (s)", "size (MB)"))
+        for name in codec.codecs:
+            saved, reloaded, size = bench(name)
+            print("{:>8}  {:>9.3f}  {:>11.3f}  {:>9.1f}".format(
+                name, saved, reloaded, size / 1e6))
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.get as the number of stored objects grows
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_get
+The time per lookup should stay flat from one row to the next.
+"""
+
+import timeit
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+SIZES = [1000, 10000, 100000, 500000]
+LOOKUPS = 10000
+
+
+def bench(size):
+    """fills a fresh store with size objects and times LOOKUPS gets"""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    ids = []
+    for i in range(size):
+        obj = (State if i % 10 == 0 else Place)()
+        storage.new(obj)
+        if i % 10 == 0:
+            ids.append(obj.id)
+    targets = [ids[i % len(ids)] for i in range(LOOKUPS)]
+
+    def lookups():
+        """one round of lookups"""
+        for obj_id in targets:
+            storage.get(State, obj_id)
+
+    return min(timeit.repeat(lookups, number=1, repeat=3)) / LOOKUPS
+
+
+if __name__ == "__main__":
+    print("{:>10}  {:>12}".format("objects", "usec/get"))
+    for size in SIZES:
+        print("{:>10}  {:>12.3f}".format(size, bench(size) * 1e6))
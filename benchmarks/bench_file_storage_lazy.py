@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Measures the cold start of a worker that only lists amenities: reload()
+then all(Amenity), reading every class up front and reading each class
+when first used (HBNB_FILE_LAZY)
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_lazy
+The store holds 100 amenities next to SIZE users, places and reviews.
+"""
+
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+SIZE = 100000
+
+
+def write_store():
+    """saves 100 amenities, and a third of SIZE each of users, places and
+    reviews"""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    for i in range(100):
+        storage.new(Amenity(name="amenity {}".format(i)))
+    for i in range(SIZE // 3):
+        user = User(email="user{}@hbnb.io".format(i), password="pwd")
+        place = Place(name="place {}".format(i), city_id="city",
+                      user_id=user.id, number_rooms=i % 5)
+        review = Review(text="Great stay", place_id=place.id,
+                        user_id=user.id)
+        for obj in (user, place, review):
+            storage.new(obj)
+    storage.save()
+
+
+def bench(lazy):
+    """returns the seconds and the bytes taken by reload() and listing the
+    amenities"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__lazy = lazy
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    storage = FileStorage()
+    storage.reload()
+    assert len(storage.all(Amenity)) == 100
+    seconds = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    FileStorage._FileStorage__objects = {}
+    return seconds, used
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        write_store()
+        print("{:>8}  {:>10}  {:>10}".format("loading", "seconds", "MB"))
+        for lazy in (False, True):
+            seconds, used = bench(lazy)
+            print("{:>8}  {:>10.3f}  {:>10.1f}".format(
+                "lazy" if lazy else "eager", seconds, used / 2 ** 20))
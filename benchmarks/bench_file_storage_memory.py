@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Measures the memory FileStorage takes per object after reload(), with one
+instance per object and with the compact column stores (HBNB_FILE_COMPACT)
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_memory
+The bytes per object include the keys of __objects and the indexes.
+
+A compact object is a proxy that only holds its row number, but it
+inherits the slots of BaseModel: the to_dict() cache, __dict__ (left
+empty, never allocated) and __weakref__, which ColumnStore.release()
+uses. They cost 32 bytes per object, included in the figures: a proxy
+takes 72 bytes, where a slot-only object with just a row would take 40.
+"""
+
+import gc
+import os
+import tempfile
+import tracemalloc
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+SIZES = [10000, 100000]
+
+
+def write_store(size):
+    """saves size objects: a third each of users, places and reviews"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__dirty = {}
+    storage = FileStorage()
+    for i in range(size // 3):
+        user = User(email="user{}@hbnb.io".format(i), password="pwd",
+                    first_name="First", last_name="Last")
+        place = Place(name="place {}".format(i), city_id="city",
+                      user_id=user.id, description="A place to stay",
+                      number_rooms=i % 5, max_guest=i % 7,
+                      price_by_night=50 + i % 300, latitude=37.7,
+                      longitude=-122.4, amenity_ids=[])
+        review = Review(text="Great stay", place_id=place.id,
+                        user_id=user.id)
+        for obj in (user, place, review):
+            storage.new(obj)
+    storage.save()
+
+
+def bench(compact):
+    """returns the bytes per object taken by reloading the saved store"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__compact = compact
+    FileStorage._FileStorage__stores = {}
+    # load every object now, not when its class is first used
+    FileStorage._FileStorage__lazy = False
+    gc.collect()
+    tracemalloc.start()
+    FileStorage().reload()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = len(FileStorage._FileStorage__objects)
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__stores = {}
+    return used / count
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{:>10}  {:>16}  {:>16}".format("objects", "bytes/obj (inst)",
+                                              "bytes/obj (cols)"))
+        for size in SIZES:
+            write_store(size)
+            print("{:>10}  {:>16.0f}  {:>16.0f}".format(
+                size, bench(False), bench(True)))
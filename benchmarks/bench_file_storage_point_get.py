@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Measures a worker that serves single places by id right after reload():
+get(Place, id) reading the whole Place class from the file, and reading
+the one place through the memory-mapped record index
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_point_get
+The store holds SIZE places; GETS ids are looked up, twice each.
+"""
+
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+SIZE = 100000
+GETS = 100
+
+
+def write_store():
+    """saves SIZE places and returns their ids"""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    ids = []
+    for i in range(SIZE):
+        place = Place(name="place {}".format(i), city_id="city",
+                      user_id="user", number_rooms=i % 5)
+        storage.new(place)
+        ids.append(place.id)
+    storage.save()
+    return ids
+
+
+def bench(ids, point):
+    """returns the seconds and the bytes taken by reload() and the gets,
+    with or without the record index"""
+    ids_path = FileStorage._FileStorage__file_path + ".ids"
+    if not point:
+        os.rename(ids_path, ids_path + ".off")
+    FileStorage._FileStorage__objects = {}
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    storage = FileStorage()
+    storage.reload()
+    for place_id in ids + ids:
+        assert storage.get(Place, place_id).id == place_id
+    seconds = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    FileStorage._FileStorage__objects = {}
+    storage.reload()
+    if not point:
+        os.rename(ids_path + ".off", ids_path)
+    return seconds, used
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        ids = random.sample(write_store(), GETS)
+        print("{:>8}  {:>10}  {:>10}".format("get", "seconds", "MB"))
+        for point in (False, True):
+            seconds, used = bench(ids, point)
+            print("{:>8}  {:>10.3f}  {:>10.1f}".format(
+                "point" if point else "class", seconds, used / 2 ** 20))
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Benchmarks a one-object FileStorage.save with and without the journal
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_file_storage_save
+With the journal the time per save should not grow with the store size.
+"""
+
+import os
+import tempfile
+import timeit
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+SIZES = [1000, 10000, 100000]
+SAVES = 5
+
+
+def bench(size, journal):
+    """times SAVES single-object saves on a store of size objects"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__dirty = {}
+    FileStorage._FileStorage__journal = journal
+    FileStorage._FileStorage__journal_max = SAVES * 10
+    storage = FileStorage()
+    for i in range(size):
+        storage.new(Place(name="place {}".format(i)))
+    storage.save()
+    place = Place(name="updated")
+
+    def one_save():
+        """updates one place and saves it"""
+        place.save()
+
+    return min(timeit.repeat(one_save, number=SAVES, repeat=3)) / SAVES
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        print("{:>10}  {:>14}  {:>14}".format("objects", "ms/save (full)",
+                                              "ms/save (jrnl)"))
+        for size in SIZES:
+            print("{:>10}  {:>14.3f}  {:>14.3f}".format(
+                size, bench(size, False) * 1e3, bench(size, True) * 1e3))
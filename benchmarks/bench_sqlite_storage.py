@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Compares the JSON FileStorage with the SQLite storage
+(HBNB_TYPE_STORAGE=sqlite): saving places one at a time, a cold start,
+looking places up by id, and listing the places of one city
+
+Usage (from the repository root):
+    python3 -m benchmarks.bench_sqlite_storage
+The models are mapped when models is first imported, so each storage is
+measured in its own process, this module run with the storage name.
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SIZE = 2000
+GETS = 1000
+CITIES = 20
+
+
+def run(storage_t):
+    """measures storage_t in this process, then prints the seconds taken
+    by each step as JSON"""
+    import models
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+    from models.user import User
+    storage = models.storage
+    times = {}
+    state = State(name="North")
+    state.save()
+    user = User(email="a@b.c", password="pwd")
+    user.save()
+    cities = [City(name="city {}".format(i), state_id=state.id)
+              for i in range(CITIES)]
+    for city in cities:
+        city.save()
+    ids = []
+    start = time.perf_counter()
+    for i in range(SIZE):
+        place = Place(name="place {}".format(i), user_id=user.id,
+                      city_id=cities[i % CITIES].id, number_rooms=i % 5)
+        place.save()
+        ids.append(place.id)
+    times["save"] = time.perf_counter() - start
+    storage.close()
+    start = time.perf_counter()
+    if storage_t == "file":
+        storage._FileStorage__objects = {}
+    storage.reload()
+    times["reload"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for place_id in random.sample(ids, GETS):
+        assert storage.get(Place, place_id).id == place_id
+    times["get"] = time.perf_counter() - start
+    start = time.perf_counter()
+    places = storage.page(Place, SIZE, city_id=cities[0].id)
+    assert len(places) == SIZE // CITIES
+    times["list"] = time.perf_counter() - start
+    storage.close()
+    print(json.dumps(times))
+
+
+def measure(storage_t, tmp):
+    """returns the seconds of each step for storage_t, run in a child
+    process with its own store in tmp"""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("HBNB_")}
+    env["PYTHONPATH"] = os.getcwd()
+    if storage_t == "sqlite":
+        env["HBNB_TYPE_STORAGE"] = "sqlite"
+        env["HBNB_SQLITE_PATH"] = os.path.join(tmp, "hbnb.db")
+    out = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.bench_sqlite_storage", storage_t],
+        env=env, cwd=tmp, universal_newlines=True)
+    return json.loads(out.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        print("{:>8}  {:>10}  {:>10}  {:>10}  {:>10}".format(
+            "storage", "save", "reload", "get", "list"))
+        for storage_t in ("file", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                times = measure(storage_t, tmp)
+            print("{:>8}  {:>10.3f}  {:>10.3f}  {:>10.3f}  {:>10.3f}".format(
+                storage_t, times["save"], times["reload"], times["get"],
+                times["list"]))
@@ -8,7 +8,13 @@ from os import getenv
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # a SQLite file holds the same SQLAlchemy models as MySQL: the models
+    # and their callers only need to know that storage is a database
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
@@ -13,6 +13,20 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(value):
+    """parses a datetime written in the time format"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """writes a datetime in the time format"""
+    return value.isoformat(timespec="microseconds")
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -25,19 +39,33 @@ class BaseModel:
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        # the to_dict() cache lives in a slot, outside of __dict__
+        __slots__ = ("__to_dict", "__dict__", "__weakref__")
+
+        def __setattr__(self, name, value):
+            """sets an attribute and forgets the cached to_dict() result"""
+            object.__setattr__(self, name, value)
+            object.__setattr__(self, "_BaseModel__to_dict", None)
+
+        def __delattr__(self, name):
+            """deletes an attribute and forgets the cached to_dict() result"""
+            object.__delattr__(self, name)
+            object.__setattr__(self, "_BaseModel__to_dict", None)
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
+            # nothing is cached yet, skip the __setattr__ invalidation
             for key, value in kwargs.items():
                 if key != "__class__":
-                    setattr(self, key, value)
+                    object.__setattr__(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -53,21 +81,41 @@ class BaseModel:
                                          self.__dict__)
 
     def save(self):
-        """updates the attribute 'updated_at' with the current datetime"""
+        """updates the attribute 'updated_at' with the current datetime
+
+        Inside a models.storage.batch() block the object is written, along
+        with the others saved in the block, when the block ends.
+        """
         self.updated_at = datetime.utcnow()
         models.storage.new(self)
         models.storage.save()
 
     def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
+        """returns a dictionary containing all keys/values of the instance
+
+        In file storage mode the result is cached on the instance until one
+        of its attributes is set or deleted, and a copy of it is returned.
+        """
+        cached = getattr(self, "_BaseModel__to_dict", None)
+        if type(cached) is dict:
+            return cached.copy()
+        if models.storage_t != "db":
+            # an attribute set by another thread while the dict is built
+            # replaces the token, and the stale dict is not cached
+            token = object()
+            object.__setattr__(self, "_BaseModel__to_dict", token)
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+        if models.storage_t != "db":
+            if getattr(self, "_BaseModel__to_dict", None) is token:
+                object.__setattr__(self, "_BaseModel__to_dict", new_dict)
+            return new_dict.copy()
         return new_dict
 
     def delete(self):
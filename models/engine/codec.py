@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage writes its file with
+
+HBNB_FILE_CODEC picks the codec save() writes with: json (the default),
+orjson or msgpack. A codec whose module is not installed falls back to
+json. reload() finds the format of the file from its content, whatever
+the codec, so a file.json written before switching codecs is still read,
+and rewritten in the new format by the next save().
+"""
+
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# starts the header line of the files that are not plain JSON, followed
+# by the format name: b"%HBNB msgpack\n"
+MAGIC = b"%HBNB "
+
+
+class JsonCodec:
+    """Reads and writes plain JSON with the json module"""
+    name = "json"
+    # format named in the file header, None for plain JSON that has none
+    format = None
+
+    def dumps(self, data):
+        """returns data encoded as bytes"""
+        return json.dumps(data).encode("utf-8")
+
+    def loads(self, payload):
+        """returns the data decoded from the bytes payload"""
+        return json.loads(payload)
+
+    def encode(self, data):
+        """returns the content of a file holding data: the header of the
+        format if it has one, then the encoded data"""
+        if self.format is None:
+            return self.dumps(data)
+        return MAGIC + self.format + b"\n" + self.dumps(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Reads and writes plain JSON with orjson"""
+    name = "orjson"
+
+    def dumps(self, data):
+        """returns data encoded as bytes"""
+        return orjson.dumps(data)
+
+    def loads(self, payload):
+        """returns the data decoded from the bytes payload; a file that the
+        json module wrote with NaN or Infinity, that orjson rejects, is
+        read with json"""
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return json.loads(payload)
+
+
+class MsgpackCodec(JsonCodec):
+    """Reads and writes MessagePack, behind a header"""
+    name = "msgpack"
+    format = b"msgpack"
+
+    def dumps(self, data):
+        """returns data encoded as bytes"""
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload):
+        """returns the data decoded from the bytes payload"""
+        return msgpack.unpackb(payload, raw=False)
+
+
+# codecs whose module is installed, by name
+codecs = {"json": JsonCodec()}
+if orjson is not None:
+    codecs["orjson"] = OrjsonCodec()
+if msgpack is not None:
+    codecs["msgpack"] = MsgpackCodec()
+# the fastest codec installed for plain JSON
+JSON = codecs.get("orjson", codecs["json"])
+
+
+def get(name):
+    """returns the codec called name, or the json one if it is unknown or
+    its module is not installed"""
+    return codecs.get(name, codecs["json"])
+
+
+def decode(data):
+    """returns the data held by the bytes data, in the format named by its
+    header, or plain JSON when it has none"""
+    if not data.startswith(MAGIC):
+        return JSON.loads(data)
+    end = data.index(b"\n")
+    fmt = data[len(MAGIC):end]
+    for codec in codecs.values():
+        if codec.format == fmt:
+            return codec.loads(data[end + 1:])
+    raise ValueError("no codec installed for {} files".format(fmt.decode()))
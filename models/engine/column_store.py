@@ -0,0 +1,343 @@
+#!/usr/bin/python3
+"""
+Contains the ColumnStore class, the compact in-memory layout FileStorage
+keeps the objects it loads in when HBNB_FILE_COMPACT is set
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from models.base_model import format_time, parse_time
+import sys
+import uuid
+import weakref
+
+# marks a value that was never set on an object, its class default is used
+MISSING = object()
+# datetimes are kept as microseconds since EPOCH
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# the smallest 8 byte integer, marks the empty rows of integer arrays
+NO_INT = -2 ** 63
+
+
+class Column:
+    """One attribute of every object of a ColumnStore, a value per row.
+
+    Set on the proxy class, the column is the data descriptor its objects
+    read and write the attribute through.
+    """
+
+    def __init__(self, name, default=MISSING):
+        """initializes an empty column for the attribute name"""
+        self.name = name
+        self.default = default
+        self.values = []
+        # foreign keys repeat across rows, keep a single copy of each
+        self.intern = name.endswith("_id")
+
+    def pack(self, value):
+        """returns value as kept in the column"""
+        if self.intern and type(value) is str:
+            return sys.intern(value)
+        return value
+
+    def append(self, value):
+        """adds a row holding value"""
+        self.values.append(self.pack(value))
+
+    def load(self, row):
+        """returns the value of row, MISSING if it has none"""
+        return self.values[row]
+
+    def store(self, row, value):
+        """sets the value of row"""
+        self.values[row] = self.pack(value)
+
+    def __get__(self, obj, owner):
+        """returns the attribute of obj, or its class default"""
+        if obj is None:
+            return self
+        value = self.load(obj._compact_row)
+        if value is MISSING:
+            if self.default is MISSING:
+                raise AttributeError(self.name)
+            return self.default
+        return value
+
+    def __set__(self, obj, value):
+        """sets the attribute of obj"""
+        self.store(obj._compact_row, value)
+
+    def __delete__(self, obj):
+        """removes the attribute of obj, its class default shows again"""
+        self.store(obj._compact_row, MISSING)
+
+
+class IdColumn(Column):
+    """The id column, that keeps the <class name>.<id> key of each object
+    so that FileStorage.__objects can share it"""
+
+    def __init__(self, name, prefix):
+        """initializes an empty column of ids, keys starting with prefix"""
+        super().__init__(name)
+        self.prefix = prefix
+
+    def pack(self, value):
+        """returns value as kept in the column"""
+        if type(value) is str:
+            return self.prefix + value
+        return value
+
+    def load(self, row):
+        """returns the value of row, MISSING if it has none"""
+        value = self.values[row]
+        if type(value) is str:
+            return value[len(self.prefix):]
+        return value
+
+
+class ArrayColumn(Column):
+    """A column of one kind of values packed into an array of typecode.
+
+    EMPTY is the item of the rows that hold MISSING or a value of another
+    kind, which are kept aside in others.
+    """
+    typecode = "q"
+    EMPTY = NO_INT
+
+    def __init__(self, name, default=MISSING):
+        """initializes an empty column for the attribute name"""
+        super().__init__(name, default)
+        self.values = array(self.typecode)
+        # row -> value, for the rows whose value does not fit the array
+        self.others = {}
+
+    def to_item(self, value):
+        """returns value packed for the array, None if it does not fit"""
+        if type(value) is int and NO_INT < value < -NO_INT:
+            return value
+        return None
+
+    def from_item(self, item):
+        """returns the value packed into item"""
+        return item
+
+    def append(self, value):
+        """adds a row holding value"""
+        self.values.append(self.EMPTY)
+        self.store(len(self.values) - 1, value)
+
+    def load(self, row):
+        """returns the value of row, MISSING if it has none"""
+        item = self.values[row]
+        if item == self.EMPTY:
+            return self.others.get(row, MISSING)
+        return self.from_item(item)
+
+    def store(self, row, value):
+        """sets the value of row"""
+        self.others.pop(row, None)
+        item = self.to_item(value)
+        if item is None or item == self.EMPTY:
+            self.values[row] = self.EMPTY
+            if value is not MISSING:
+                self.others[row] = value
+        else:
+            self.values[row] = item
+
+
+class FloatColumn(ArrayColumn):
+    """A column of floats, kept as 8 byte doubles"""
+    typecode = "d"
+    EMPTY = float("-inf")
+
+    def to_item(self, value):
+        """returns value packed for the array, None if it does not fit"""
+        return value if type(value) is float else None
+
+
+class TimeColumn(ArrayColumn):
+    """A column of datetimes, kept as 8 byte integers of microseconds"""
+
+    def to_item(self, value):
+        """returns value packed for the array, None if it does not fit"""
+        if type(value) is datetime and value.tzinfo is None:
+            return (value - EPOCH) // MICROSECOND
+        return None
+
+    def from_item(self, item):
+        """returns the value packed into item"""
+        return EPOCH + timedelta(microseconds=item)
+
+
+# column class of the attributes, by the type of their class default
+kinds = {int: ArrayColumn, float: FloatColumn}
+
+
+class CompactModel:
+    """Base of the proxy classes of the ColumnStores, placed before the
+    model class so that these methods replace the BaseModel ones"""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        """returns an attribute that has no column"""
+        if name.startswith("_compact"):
+            raise AttributeError(name)
+        try:
+            return self._compact_store.extras[self._compact_row][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        """sets an attribute in its column, or with the row extras"""
+        store = self._compact_store
+        if name in store.columns:
+            object.__setattr__(self, name, value)
+        else:
+            store.extras.setdefault(self._compact_row, {})[name] = value
+
+    def __delattr__(self, name):
+        """removes an attribute from its column or from the row extras"""
+        store = self._compact_store
+        if name in store.columns:
+            object.__delattr__(self, name)
+            return
+        try:
+            del store.extras[self._compact_row][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __str__(self):
+        """String representation, the same as the model class one"""
+        return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
+                                         self._compact_store.attributes(self))
+
+    def to_dict(self):
+        """returns a dictionary containing all keys/values of the instance"""
+        new_dict = self._compact_store.attributes(self)
+        if "created_at" in new_dict:
+            new_dict["created_at"] = format_time(new_dict["created_at"])
+        if "updated_at" in new_dict:
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
+        new_dict["__class__"] = self.__class__.__name__
+        return new_dict
+
+
+class ColumnStore:
+    """Keeps the objects of one model class as rows of columns.
+
+    The objects are handed out as proxies: instances of a subclass of the
+    model class, named like it, that only hold their row number and find
+    their attributes in the columns. The model class attributes, such as
+    Place.name, each get a column; any other attribute is kept in the
+    extras of its row. The row of an object deleted from storage is reused
+    once its proxy is gone, see release(): a proxy kept after the delete
+    still reads its own attributes.
+    """
+
+    def __init__(self, cls):
+        """initializes an empty store for the objects of the class cls"""
+        self.cls = cls
+        self.rows = 0
+        # row -> {name: value} of the attributes that have no column
+        self.extras = {}
+        # row -> finalizer, of the released rows whose proxy is still held
+        self.released = {}
+        # rows of released objects whose proxy is gone, for add() to reuse
+        self.free = []
+        self.columns = {"id": IdColumn("id", cls.__name__ + "."),
+                        "created_at": TimeColumn("created_at"),
+                        "updated_at": TimeColumn("updated_at")}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if (name.startswith("_") or callable(value) or
+                        isinstance(value, (property, classmethod,
+                                           staticmethod))):
+                    continue
+                column = kinds.get(type(value), Column)
+                self.columns[name] = column(name, value)
+        namespace = dict(self.columns)
+        namespace.update(__slots__=("_compact_row",), _compact_store=self,
+                         __doc__=cls.__doc__, __module__=cls.__module__,
+                         __qualname__=cls.__qualname__)
+        self.proxy = type(cls.__name__, (CompactModel, cls), namespace)
+
+    def __values(self, attrs):
+        """returns the attributes of a new object built from attrs, as
+        BaseModel.__init__ would set them"""
+        values = dict(attrs)
+        values.pop("__class__", None)
+        for name in ("created_at", "updated_at"):
+            value = values.get(name)
+            if value and type(value) is str:
+                values[name] = parse_time(value)
+            elif type(value) is not datetime:
+                values[name] = datetime.utcnow()
+        if values.get("id") is None:
+            values["id"] = str(uuid.uuid4())
+        return values
+
+    def add(self, attrs):
+        """returns the proxy of a new row holding attrs, a dictionary such
+        as a to_dict() result"""
+        values = self.__values(attrs)
+        if self.free:
+            row = self.free.pop()
+            for name, column in self.columns.items():
+                column.store(row, values.pop(name, MISSING))
+        else:
+            row = self.rows
+            for name, column in self.columns.items():
+                column.append(values.pop(name, MISSING))
+            self.rows += 1
+        if values:
+            self.extras[row] = values
+        proxy = self.proxy.__new__(self.proxy)
+        object.__setattr__(proxy, "_compact_row", row)
+        return proxy
+
+    def assign(self, proxy, attrs):
+        """replaces the attributes of proxy with attrs, a dictionary such
+        as a to_dict() result"""
+        values = self.__values(attrs)
+        row = proxy._compact_row
+        for name, column in self.columns.items():
+            column.store(row, values.pop(name, MISSING))
+        if values:
+            self.extras[row] = values
+        else:
+            self.extras.pop(row, None)
+
+    def release(self, proxy):
+        """lets the row of proxy, whose object left storage, be reused once
+        no one holds proxy anymore: each row has a single proxy"""
+        row = proxy._compact_row
+        if row not in self.released:
+            finalizer = weakref.finalize(proxy, self.__free, row)
+            finalizer.atexit = False
+            self.released[row] = finalizer
+
+    def __free(self, row):
+        """empties the released row, whose proxy is gone, for add()"""
+        self.released.pop(row, None)
+        for column in self.columns.values():
+            column.store(row, MISSING)
+        self.extras.pop(row, None)
+        self.free.append(row)
+
+    def key(self, proxy):
+        """returns the <class name>.<id> key of proxy, as kept in the id
+        column"""
+        return self.columns["id"].values[proxy._compact_row]
+
+    def attributes(self, proxy):
+        """returns the attributes set on proxy, like the __dict__ of an
+        instance of the model class"""
+        row = proxy._compact_row
+        attrs = {}
+        for name, column in self.columns.items():
+            value = column.load(row)
+            if value is not MISSING:
+                attrs[name] = value
+        attrs.update(self.extras.get(row, ()))
+        return attrs
@@ -11,12 +11,109 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from contextlib import contextmanager
+from itertools import chain
 from os import getenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import Column, Integer, String, Table
+from sqlalchemy import create_engine, event, func, inspect, or_, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+from time import monotonic
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+loaders = {"selectin": selectinload, "joined": joinedload}
+# pool options that can be set from the environment: option, variable, type
+pool_settings = (("pool_size", "HBNB_MYSQL_POOL_SIZE", int),
+                 ("max_overflow", "HBNB_MYSQL_MAX_OVERFLOW", int),
+                 ("pool_timeout", "HBNB_MYSQL_POOL_TIMEOUT", float))
+
+if models.storage_t == "db":
+    # one row per class, whose counter is bumped when a transaction that
+    # adds, updates or deletes rows of the class commits, see generation()
+    generations = Table("generations", Base.metadata,
+                        Column("name", String(60), primary_key=True),
+                        Column("generation", Integer, nullable=False))
+
+
+def sqlite_pragmas(dbapi_connection, connection_record):
+    """sets up each connection to a SQLite file: write-ahead logging, that
+    lets readers go on while a transaction commits and only syncs the log
+    at checkpoints, and foreign keys enforced as MySQL does"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def changed(session, names):
+    """notes that the transaction of session changes rows of the classes
+    named in names, whose generations it bumps when it commits"""
+    session.info.setdefault("changed", set()).update(names)
+
+
+def note_flushed(session, flush_context, instances):
+    """notes the classes with rows about to be added, updated or deleted
+    by the flush of session"""
+    changed(session, {type(obj).__name__ for obj in
+                      chain(session.new, session.dirty, session.deleted)})
+
+
+def bump_generations(session):
+    """bumps, right before the transaction of session commits, the
+    generation of every class it changed rows of"""
+    # commit only flushes after this hook: flush first to see every change
+    session.flush()
+    names = sorted(session.info.pop("changed", set()) & set(classes))
+    if names:
+        # one statement, at the very end of the transaction, so that the
+        # rows are only locked for the commit; it locks them in primary key
+        # order, the same in every transaction, which makes two of them
+        # wait for each other instead of deadlocking
+        session.execute(generations.update().where(
+            generations.c.name.in_(names)).values(
+            generation=generations.c.generation + 1))
+
+
+def forget_changed(session, previous_transaction):
+    """forgets the classes changed by the transaction rolled back"""
+    session.info.pop("changed", None)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that counts checkouts and how long they wait for a
+    connection to be available"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate the pool with zeroed metrics"""
+        super().__init__(*args, **kwargs)
+        self.__lock = Lock()
+        self.__checkouts = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+
+    def _do_get(self):
+        """checks a connection out of the pool, timing the wait"""
+        start = monotonic()
+        conn = super()._do_get()
+        wait = monotonic() - start
+        with self.__lock:
+            self.__checkouts += 1
+            self.__wait_total += wait
+            self.__wait_max = max(self.__wait_max, wait)
+        return conn
+
+    def metrics(self):
+        """returns the checkout count and wait times in seconds"""
+        with self.__lock:
+            return {"checkouts": self.__checkouts,
+                    "wait_total": self.__wait_total,
+                    "wait_max": self.__wait_max}
 
 
 class DBStorage:
@@ -24,50 +121,190 @@ class DBStorage:
     __engine = None
     __session = None
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
+    def __init__(self, url=None):
+        """Instantiate a DBStorage object, connected to the database of the
+        SQLAlchemy url, or of the HBNB_MYSQL_* settings"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        # a full SQLAlchemy URL, such as sqlite:///hbnb.db, replaces the
+        # MySQL settings above, e.g. to test locally without a server
+        url = make_url(url or getenv('HBNB_MYSQL_URL') or
+                       'mysql+mysqldb://{}:{}@{}/{}'.format(HBNB_MYSQL_USER,
+                                                            HBNB_MYSQL_PWD,
+                                                            HBNB_MYSQL_HOST,
+                                                            HBNB_MYSQL_DB))
+        options = {
+            "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING', '1') != '0',
+            "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600))
+        }
+        if (url.get_backend_name() != 'sqlite' or
+                url.database not in (None, '', ':memory:')):
+            # an in-memory SQLite database lives in a single connection,
+            # every other database gets a pool that times its checkouts
+            options["poolclass"] = TimedQueuePool
+            for option, var, conv in pool_settings:
+                if getenv(var):
+                    options[option] = conv(getenv(var))
+        self.__engine = create_engine(url, **options)
+        if (url.get_backend_name() == 'sqlite' and
+                url.database not in (None, '', ':memory:')):
+            event.listen(self.__engine, "connect", sqlite_pragmas)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def __eager_options(self, cls, eager):
+        """returns the loader options for the relationships of cls named in
+        eager, a dict of dotted paths to "selectin" or "joined"; paths that
+        do not start with a relationship of cls are left out"""
+        options = []
+        for path, strategy in (eager or {}).items():
+            option, owner = None, cls
+            for name in path.split("."):
+                relation = inspect(owner).relationships.get(name)
+                if relation is None:
+                    break
+                attr = getattr(owner, name)
+                if option is None:
+                    option = loaders[strategy](attr)
+                else:
+                    option = getattr(option, loaders[strategy].__name__)(attr)
+                owner = relation.mapper.class_
+            if option is not None:
+                options.append(option)
+        return options
+
+    def all(self, cls=None, eager=None):
+        """query on the current database session
+
+        eager maps relationship paths such as "cities" or "cities.places"
+        to the loading strategy, "selectin" or "joined", used to fetch them
+        with the objects instead of one query per object later on.
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                query = query.options(*self.__eager_options(classes[clss],
+                                                            eager))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
-    def get(self, cls, id):
-        ''' A method to retrieve one object '''
+    def get(self, cls, id, *, eager=None):
+        ''' A method to retrieve one object, see all() for eager '''
         obj = None
         if cls is not None and issubclass(cls, BaseModel):
-            obj = self.__session.query(cls).filter(cls.id == id).first()
+            query = self.__session.query(cls)
+            query = query.options(*self.__eager_options(cls, eager))
+            obj = query.filter(cls.id == id).first()
         return obj
 
     def count(self, cls=None):
         ''' Returns the number of objects in storage of given class '''
-        return len(self.all(cls))
+        total = 0
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(func.count(classes[clss].id))
+                total += query.scalar()
+        return total
+
+    def generation(self, cls):
+        """returns a string that changes whenever a cls row is added,
+        updated or deleted, by this process or another one: the counter of
+        cls in the generations table, bumped by every transaction that
+        changes its rows when it commits"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(generations.c.generation).filter(
+            generations.c.name == cls.__name__)
+        return str(query.scalar())
+
+    def page(self, cls, limit, after=None, **filters):
+        """returns up to limit cls objects ordered by id, whose id comes
+        after the id after and whose attributes match filters"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls).filter_by(**filters)
+        if after is not None:
+            query = query.filter(cls.id > after)
+        return query.order_by(cls.id).limit(limit).all()
+
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """returns up to limit places ordered by id, whose id comes after
+        the id after, that are in one of the states or cities (anywhere when
+        both are empty) and have every amenity of amenities"""
+        from models.place import place_amenity
+        query = self.__session.query(Place)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(list(states)),
+                    City.id.in_(list(cities))))
+        amenities = set(amenities)
+        if amenities:
+            with_all = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(place_amenity.c.amenity_id) == len(amenities))
+            query = query.filter(Place.id.in_(with_all))
+        if after is not None:
+            query = query.filter(Place.id > after)
+        return query.order_by(Place.id).limit(limit).all()
+
+    def iterate(self, cls, **filters):
+        """yields the cls objects matching filters in id order, fetching
+        rows from a server-side cursor in batches"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return iter(())
+        query = self.__session.query(cls).filter_by(**filters)
+        return query.order_by(cls.id).yield_per(500)
 
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """insert the new objects objs in one go, without adding them to
+        the current database session; save() commits them"""
+        objs = list(objs)
+        self.__session.bulk_save_objects(objs)
+        # bulk inserts skip the flush events
+        changed(self.__session, {type(obj).__name__ for obj in objs})
+
     def save(self):
-        """commit all changes of the current database session"""
-        self.__session.commit()
+        """commit all changes of the current database session, or leave
+        them to the end of the batch() this thread is in"""
+        if not self.__session.info.get("batch"):
+            self.__session.commit()
+
+    @contextmanager
+    def batch(self):
+        """groups the changes of the block into one transaction of the
+        current session, committed at its end or rolled back if it raises;
+        a batch inside another one is part of it"""
+        info = self.__session.info
+        if info.get("batch"):
+            yield self
+            return
+        info["batch"] = True
+        try:
+            yield self
+            info["batch"] = False
+            self.__session.commit()
+        except BaseException:
+            self.__session.rollback()
+            raise
+        finally:
+            info["batch"] = False
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -75,12 +312,53 @@ class DBStorage:
             self.__session.delete(obj)
 
     def reload(self):
-        """reloads data from the database"""
+        """reloads data from the database, creating the missing tables and
+        the indexes that tables created before them lack"""
         Base.metadata.create_all(self.__engine)
+        self.__create_indexes()
+        self.__create_generations()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "before_flush", note_flushed)
+        event.listen(sess_factory, "before_commit", bump_generations)
+        event.listen(sess_factory, "after_soft_rollback", forget_changed)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def __create_indexes(self):
+        """creates the indexes of the models that are missing from their
+        tables, so that an existing database gets the ones added since"""
+        inspector = inspect(self.__engine)
+        for table in Base.metadata.sorted_tables:
+            names = {index["name"]
+                     for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in names:
+                    index.create(self.__engine)
+
+    def __create_generations(self):
+        """adds the generations rows of the classes that have none yet"""
+        try:
+            with self.__engine.begin() as conn:
+                known = set(conn.scalars(select(generations.c.name)))
+                rows = [{"name": name, "generation": 0}
+                        for name in classes if name not in known]
+                if rows:
+                    conn.execute(generations.insert(), rows)
+        except IntegrityError:
+            # another process added them first
+            pass
+
+    def pool_stats(self):
+        """returns the size, usage and checkout metrics of the pool"""
+        pool = self.__engine.pool
+        stats = {"status": pool.status()}
+        if isinstance(pool, QueuePool):
+            for name in ("size", "checkedin", "checkedout", "overflow"):
+                stats[name] = getattr(pool, name)()
+        if isinstance(pool, TimedQueuePool):
+            stats.update(pool.metrics())
+        return stats
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
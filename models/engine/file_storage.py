@@ -3,14 +3,26 @@
 Contains the FileStorage class
 """
 
-import json
+from bisect import bisect_right, insort
+from contextlib import contextmanager
+import gc
+import os
+import threading
+import uuid
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import codec
+from models.engine.column_store import ColumnStore, CompactModel
+from models.engine.record_index import RecordIndex, digest
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -23,61 +35,929 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - secondary index of __objects: <class name> -> {key: obj}
+    __by_class = {}
+    # dictionary - foreign key attributes kept in a reverse index, by class;
+    # each id in a list attribute such as amenity_ids is indexed on its own
+    __foreign_keys = {"City": ("state_id",),
+                      "Place": ("city_id", "user_id", "amenity_ids"),
+                      "Review": ("place_id", "user_id")}
+    # dictionary - reverse index: (<class name>, attr) -> {value: {key: obj}}
+    __by_fk = {}
+    # dictionary - key -> foreign key values the object is indexed under
+    __fk_values = {}
+    # dictionary - <class name> -> sorted list of its keys, built on demand
+    __sorted_keys = {}
+    # dictionary - the __objects dict that the indexes were built from
+    __indexed = None
+    # tuple - stat stamps of the JSON file and journal when last seen
+    __file_stamp = None
+    # boolean - append changes to <__file_path>.journal instead of
+    # rewriting the whole JSON file on every save()
+    __journal = os.getenv("HBNB_FILE_JOURNAL", "") not in ("", "0")
+    # integer - journal entries after which save() compacts the journal
+    __journal_max = int(os.getenv("HBNB_FILE_JOURNAL_MAX", 1000))
+    # integer - number of entries currently in the journal
+    __journal_len = 0
+    # dictionary - changes since the last save(): key -> obj, None if deleted
+    __dirty = {}
+    # boolean - keep the objects read by reload() in per-class columns
+    # instead of one instance each, see models/engine/column_store.py
+    __compact = os.getenv("HBNB_FILE_COMPACT", "") not in ("", "0")
+    # dictionary - <class name> -> ColumnStore of its compact objects
+    __stores = {}
+    # codec - format save() writes the file in, see models/engine/codec.py
+    __codec = codec.get(os.getenv("HBNB_FILE_CODEC", "json"))
+    # float - seconds save() waits for more saves to write them all at once,
+    # 0 to write on every save()
+    __save_delay = float(os.getenv("HBNB_FILE_SAVE_DELAY", 0))
+    # threading.Timer - the pending delayed write, if any
+    __timer = None
+    # lock - serializes the writers: new(), delete(), save(), reload() and
+    # the index builds; readers never take it, they only use dict and list
+    # operations that are atomic under the GIL
+    __lock = threading.RLock()
+    # tuple - (path, number) generation of the file when this process last
+    # read or wrote it; <__file_path>.lock holds the number, that every
+    # write bumps, and is locked with fcntl against the other processes
+    __generation = None
+    # integer - bytes of the journal already replayed or written
+    __journal_offset = 0
+    # dictionary - while a batch() runs, the __dirty it started with; the
+    # thread running it holds __lock until it ends
+    __batch = None
+    # boolean - save() was called during the running batch()
+    __batch_saved = False
+    # dictionary - <class name> -> number of times one of its objects was
+    # stored or dropped, see generation()
+    __class_generations = {}
+    # string - names the __objects dict whose changes are counted, renewed
+    # when it is replaced
+    __epoch = uuid.uuid4().hex
+    # boolean - let reload() leave the objects of each class in the file
+    # until the class is first used, see __read()
+    __lazy = os.getenv("HBNB_FILE_LAZY", "1") not in ("", "0")
+    # set - names of the classes whose objects reload() left in the file
+    __deferred = set()
+    # dictionary - the __objects dict that __deferred goes with
+    __deferred_for = None
+    # RecordIndex - the mapped index of the objects in the JSON file, that
+    # get() reads an object of a deferred class through, see __point_get()
+    __records = None
+    # dictionary - key -> object of a deferred class read alone by get()
+    __point_cache = {}
+    # integer - most objects kept in __point_cache
+    __point_cache_size = int(os.getenv("HBNB_FILE_POINT_CACHE", 10000))
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def __journal_path(self):
+        """returns the path of the journal that goes with the JSON file"""
+        return self.__file_path + ".journal"
+
+    def __lock_path(self):
+        """returns the path of the lock file that goes with the JSON file"""
+        return self.__file_path + ".lock"
+
+    def __index_path(self):
+        """returns the path of the index of the class sections of the JSON
+        file"""
+        return self.__file_path + ".index"
+
+    def __ids_path(self):
+        """returns the path of the index of the objects of the JSON file,
+        see models/engine/record_index.py"""
+        return self.__file_path + ".ids"
+
+    @contextmanager
+    def __locked(self, exclusive):
+        """holds the lock file for the block, exclusive for a writer and
+        shared for a reader, and yields it open
+
+        Only a writer creates the lock file. A reader that finds none, or
+        cannot open it, takes no lock and gets None: nothing was written
+        yet, and a process that only reads, maybe from a directory it
+        cannot write to, leaves no file behind.
+        """
+        try:
+            f = open(self.__lock_path(), 'a+' if exclusive else 'r')
+        except OSError:
+            if exclusive:
+                raise
+            yield None
+            return
+        with f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield f
+
+    def __generation_of(self, lock_file=None):
+        """returns the (path, number) generation of the JSON file, read
+        from the open lock_file, or from the lock file path"""
+        try:
+            if lock_file is None:
+                with open(self.__lock_path()) as f:
+                    text = f.read()
+            else:
+                lock_file.seek(0)
+                text = lock_file.read()
+            number = int(text or 0)
+        except (OSError, ValueError):
+            number = 0
+        return (self.__file_path, number)
+
+    def __stat(self):
+        """returns the (inode, size, mtime) stamps of the JSON file and of
+        the journal"""
+        stamps = []
+        for path in (self.__file_path, self.__journal_path()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(stamps)
+
+    def __fk_tuple(self, obj):
+        """returns the values of the indexed foreign keys of obj"""
+        values = []
+        for attr in self.__foreign_keys.get(obj.__class__.__name__, ()):
+            value = getattr(obj, attr, None)
+            values.append(tuple(value) if isinstance(value, list) else value)
+        return tuple(values)
+
+    def __index(self, key, obj):
+        """adds obj to the per-class and foreign key indexes"""
+        name = obj.__class__.__name__
+        if key not in FileStorage.__by_class.get(name, {}):
+            if name in FileStorage.__sorted_keys:
+                insort(FileStorage.__sorted_keys[name], key)
+        FileStorage.__by_class.setdefault(name, {})[key] = obj
+        values = self.__fk_tuple(obj)
+        for attr, value in zip(self.__foreign_keys.get(name, ()), values):
+            bucket = FileStorage.__by_fk.setdefault((name, attr), {})
+            for member in value if isinstance(value, tuple) else (value,):
+                bucket.setdefault(member, {})[key] = obj
+        FileStorage.__fk_values[key] = values
+
+    def __unindex(self, key, obj):
+        """removes obj from the per-class and foreign key indexes"""
+        name = obj.__class__.__name__
+        if FileStorage.__by_class.get(name, {}).pop(key, None) is not None:
+            keys = FileStorage.__sorted_keys.get(name)
+            if keys is not None:
+                del keys[bisect_right(keys, key) - 1]
+        values = FileStorage.__fk_values.pop(key, ())
+        for attr, value in zip(self.__foreign_keys.get(name, ()), values):
+            bucket = FileStorage.__by_fk.get((name, attr), {})
+            for member in value if isinstance(value, tuple) else (value,):
+                objs = bucket.get(member)
+                if objs is not None:
+                    objs.pop(key, None)
+                    if not objs:
+                        del bucket[member]
+
+    def __class_index(self):
+        """returns the per-class index, rebuilt if __objects was replaced"""
+        if FileStorage.__indexed is not FileStorage.__objects:
+            with FileStorage.__lock:
+                if FileStorage.__indexed is not FileStorage.__objects:
+                    FileStorage.__by_class = {}
+                    FileStorage.__by_fk = {}
+                    FileStorage.__fk_values = {}
+                    FileStorage.__sorted_keys = {}
+                    for key, obj in list(FileStorage.__objects.items()):
+                        self.__index(key, obj)
+                    FileStorage.__epoch = uuid.uuid4().hex
+                    # last, so that readers wait for the whole build
+                    FileStorage.__indexed = FileStorage.__objects
+        return FileStorage.__by_class
+
+    def __reindex_if_moved(self, key, obj):
+        """re-indexes obj if one of its foreign keys changed"""
+        if FileStorage.__fk_values.get(key) != self.__fk_tuple(obj):
+            self.__unindex(key, obj)
+            self.__index(key, obj)
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and its indexes"""
+        self.__class_index()
+        old = self.__objects.get(key)
+        if old is not None:
+            self.__unindex(key, old)
+            if old is not obj:
+                self.__release(old)
+        self.__index(key, obj)
+        self.__objects[key] = obj
+        self.__count_change(obj)
+
+    def __load(self, key, jo):
+        """stores under key the object read from the dictionary jo"""
+        name = jo["__class__"]
+        if not self.__compact:
+            self.__put(key, classes[name](**jo))
+            return
+        store = FileStorage.__stores.get(name)
+        if store is None:
+            store = FileStorage.__stores[name] = ColumnStore(classes[name])
+        obj = self.__objects.get(key)
+        if type(obj) is store.proxy:
+            # reloading an object updates its row instead of adding one
+            store.assign(obj, jo)
+        else:
+            obj = store.add(jo)
+        # __objects shares the key kept in the id column
+        self.__put(store.key(obj) if store.key(obj) == key else key, obj)
+
+    def __drop(self, key):
+        """removes key from __objects and its indexes, returns the object"""
+        self.__class_index()
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            self.__unindex(key, obj)
+            self.__count_change(obj)
+            self.__release(obj)
+        return obj
+
+    def __release(self, obj):
+        """lets the ColumnStore of obj, a compact object that left
+        __objects, reuse its row once obj is gone"""
+        if isinstance(obj, CompactModel):
+            obj._compact_store.release(obj)
+
+    def __count_change(self, obj):
+        """counts a change to the objects of the class of obj, once it is
+        visible to the readers"""
+        name = obj.__class__.__name__
+        generations = FileStorage.__class_generations
+        generations[name] = generations.get(name, 0) + 1
+
+    def generation(self, cls):
+        """returns a string that changes whenever an object of cls is
+        stored or dropped, e.g. to tag the responses listing them
+
+        It is read before the objects, so that a change made meanwhile is
+        seen by the next call. Each process counts its own changes, and
+        the process id keeps their strings apart.
+        """
+        self.__class_index()
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__ensure((name,))
+        return "{}.{}.{}".format(FileStorage.__epoch, os.getpid(),
+                                 FileStorage.__class_generations.get(name, 0))
+
+    def all(self, cls=None, eager=None):
+        """returns the dictionary __objects
+
+        eager is accepted for compatibility with DBStorage: relationships
+        are already read from the in-memory indexes.
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__ensure((name,))
+            return dict(self.__class_index().get(name, {}))
+        self.__ensure(FileStorage.__deferred)
         return self.__objects
 
-    def get(self, cls, id):
-        ''' A method to retrieve one object '''
-        if cls is not None:
-            result = list(filter(lambda x: type(x) is cls and x.id == id,
-                          self.__objects.values()))
-            if result:
-                return result[0]
+    def get(self, cls, id, *, eager=None):
+        ''' A method to retrieve one object, see all() for eager; an object
+        of a class that reload() left in the file is read alone '''
+        if isinstance(cls, type):
+            name = cls.__name__
+            key = "{}.{}".format(name, id)
+            obj = self.__objects.get(key)
+            if (obj is None and
+                    FileStorage.__deferred_for is FileStorage.__objects and
+                    name in FileStorage.__deferred):
+                obj = self.__point_get(key, name)
+            if isinstance(obj, cls):
+                return obj
         return None
 
+    def __point_get(self, key, name):
+        """returns the object stored under key, of the class name that
+        reload() left in the file, read alone through the record index and
+        kept in __point_cache; or None if the file does not hold it
+
+        In compact mode, whose objects live in the columns of their class,
+        or without a record index that goes with the file, the whole class
+        is read instead.
+        """
+        obj = FileStorage.__point_cache.get(key)
+        if obj is not None:
+            return obj
+        with FileStorage.__lock:
+            if name not in self.__deferred_now():
+                return self.__objects.get(key)
+            records = None if self.__compact else FileStorage.__records
+            if records is None and not self.__compact:
+                with self.__locked(False):
+                    records = RecordIndex.open(self.__file_path,
+                                               self.__ids_path())
+                FileStorage.__records = records
+            raw = records.lookup(key) if records is not None else None
+            jo = None
+            if raw is not None:
+                jo = codec.JSON.loads(b"{" + raw + b"}").get(key)
+            if records is None or (raw is not None and jo is None):
+                # no index, or another key shares the digest of key
+                self.__ensure((name,))
+                return self.__objects.get(key)
+            if jo is None:
+                return None
+            obj = classes[jo["__class__"]](**jo)
+            cache = FileStorage.__point_cache
+            cache[key] = obj
+            while len(cache) > self.__point_cache_size:
+                del cache[next(iter(cache))]
+            return obj
+
+    def __close_records(self):
+        """closes the record index, once the file it goes with was read or
+        replaced, and forgets the objects read through it"""
+        records, FileStorage.__records = FileStorage.__records, None
+        if records is not None:
+            records.close()
+        FileStorage.__point_cache = {}
+
     def count(self, cls=None):
         ''' Returns the number of objects in storage for given class '''
-        return len(self.all(cls))
+        if cls is not None:
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__ensure((name,))
+            return len(self.__class_index().get(name, {}))
+        self.__ensure(FileStorage.__deferred)
+        return len(self.__objects)
+
+    def related(self, cls, attr, value):
+        """returns the list of cls objects whose attribute attr is value, or
+        contains value for an indexed list attribute such as amenity_ids"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__ensure((name,))
+        self.__class_index()
+        if attr in self.__foreign_keys.get(name, ()):
+            bucket = FileStorage.__by_fk.get((name, attr), {})
+            return list(bucket.get(value, {}).values())
+        return [obj for obj in self.all(cls).values()
+                if getattr(obj, attr, None) == value]
+
+    def page(self, cls, limit, after=None, **filters):
+        """returns up to limit cls objects ordered by id, whose id comes
+        after the id after and whose attributes match filters"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        if filters:
+            attr = next(iter(filters))
+            objs = []
+            for obj in self.related(cls, attr, filters[attr]):
+                if after is not None and obj.id <= after:
+                    continue
+                if all(getattr(obj, k, None) == v for k, v in filters.items()):
+                    objs.append(obj)
+            objs.sort(key=lambda obj: obj.id)
+            return objs[:limit]
+        self.__ensure((name,))
+        by_class = self.__class_index().get(name, {})
+        if name not in FileStorage.__sorted_keys:
+            with FileStorage.__lock:
+                if name not in FileStorage.__sorted_keys:
+                    FileStorage.__sorted_keys[name] = sorted(by_class)
+        keys = FileStorage.__sorted_keys[name]
+        last = None if after is None else name + "." + after
+        objs = []
+        while len(objs) < limit:
+            start = 0 if last is None else bisect_right(keys, last)
+            chunk = keys[start:start + limit - len(objs)]
+            if not chunk:
+                break
+            # a key may be deleted by another thread after the slice is
+            # taken: the page is then filled from the keys that follow, so
+            # that it is only short at the end of the class
+            objs.extend(obj for obj in map(by_class.get, chunk)
+                        if obj is not None)
+            last = chunk[-1]
+        return objs
+
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """returns up to limit places ordered by id, whose id comes after
+        the id after, that are in one of the states or cities (anywhere when
+        both are empty) and have every amenity of amenities"""
+        matches = [set(self.related(Place, "amenity_ids", amenity_id))
+                   for amenity_id in set(amenities)]
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in states:
+                city_ids.update(city.id for city in
+                                self.related(City, "state_id", state_id))
+            located = set()
+            for city_id in city_ids:
+                located.update(self.related(Place, "city_id", city_id))
+            matches.append(located)
+        if not matches:
+            return self.page(Place, limit or self.count(Place), after)
+        matches.sort(key=len)
+        places = [place for place in matches[0].intersection(*matches[1:])
+                  if after is None or place.id > after]
+        places.sort(key=lambda place: place.id)
+        return places[:limit]
+
+    def iterate(self, cls, **filters):
+        """yields the cls objects matching filters in id order, reading the
+        ordered index one page at a time"""
+        if filters:
+            for obj in self.page(cls, self.count(cls), **filters):
+                yield obj
+            return
+        after = None
+        while True:
+            objs = self.page(cls, 500, after)
+            for obj in objs:
+                yield obj
+            # page() only comes up short once the keys run out
+            if len(objs) < 500:
+                return
+            after = objs[-1].id
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with FileStorage.__lock:
+                self.__put(key, obj)
+                self.__dirty[key] = obj
+
+    def bulk_new(self, objs):
+        """calls new() on every object of objs, under one hold of the
+        lock"""
+        with FileStorage.__lock:
+            for obj in objs:
+                self.new(obj)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path), or to
+        the format of the codec set by HBNB_FILE_CODEC
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+        In journal mode only the objects passed to new() or delete() since
+        the last save() are appended to the journal, and the JSON file is
+        rewritten once the journal grows past __journal_max entries.
+        With HBNB_FILE_SAVE_DELAY set, the write happens that many seconds
+        later, along with the one of every save() made in the meantime.
+        Within a batch() the write happens when the batch ends.
+        """
+        with FileStorage.__lock:
+            if FileStorage.__batch is not None:
+                FileStorage.__batch_saved = True
+            elif self.__save_delay <= 0:
+                self.__write()
+            elif FileStorage.__timer is None:
+                # not a daemon, so that exiting waits for the last write
+                FileStorage.__timer = threading.Timer(self.__save_delay,
+                                                      self.flush)
+                FileStorage.__timer.start()
+
+    @contextmanager
+    def batch(self):
+        """groups the saves of the block into one, made at its end
+
+        If the block raises, the objects passed to new() or delete() in it
+        are put back as they were when it started, and nothing is written.
+        An object that was changed in place is read back from the file as
+        a new instance. The block holds the writer lock: the other threads
+        wait to write until it ends. A batch inside another one is part of
+        it.
+        """
+        with FileStorage.__lock:
+            if FileStorage.__batch is not None:
+                yield self
+                return
+            FileStorage.__batch = dict(self.__dirty)
+            FileStorage.__batch_saved = False
+            try:
+                yield self
+            except BaseException:
+                self.__rollback()
+                raise
+            finally:
+                FileStorage.__batch = None
+            if FileStorage.__batch_saved:
+                self.save()
+
+    def __rollback(self):
+        """puts back the objects changed by the running batch(): as new()
+        and delete() left them before it, or else as saved in the file"""
+        before = FileStorage.__batch
+        for key in self.__dirty:
+            if before.get(key) is not None:
+                self.__put(key, before[key])
+            else:
+                self.__drop(key)
+        FileStorage.__dirty = dict(before)
+        # only read the objects back: the file is not caught up with
+        stamps = (FileStorage.__file_stamp, FileStorage.__journal_len,
+                  FileStorage.__journal_offset)
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            self.__read(set(self.__objects) | set(before))
+        finally:
+            (FileStorage.__file_stamp, FileStorage.__journal_len,
+             FileStorage.__journal_offset) = stamps
+
+    def flush(self):
+        """writes now the changes of the saves waiting for their delayed
+        write, see save()"""
+        with FileStorage.__lock:
+            timer, FileStorage.__timer = FileStorage.__timer, None
+            if timer is not None:
+                timer.cancel()
+                self.__write()
+
+    def __write(self):
+        """writes the changes since the last write, see save()
+
+        When another process wrote the file since this one last saw it,
+        its changes are read first, so that they are not overwritten.
+        """
+        dirty, FileStorage.__dirty = self.__dirty, {}
+        try:
+            with self.__locked(True) as f:
+                generation = self.__generation_of(f)
+                last = FileStorage.__generation
+                if last is not None and last[0] == generation[0]:
+                    if last != generation:
+                        self.__sync(dirty, True)
+                if (self.__journal and
+                        self.__journal_len + len(dirty) <= self.__journal_max):
+                    self.__append_journal(dirty)
+                else:
+                    self.__write_snapshot()
+                f.seek(0)
+                f.truncate()
+                f.write(str(generation[1] + 1))
+                f.flush()
+                FileStorage.__generation = (generation[0], generation[1] + 1)
+                FileStorage.__file_stamp = self.__stat()
+        except BaseException:
+            # keep the changes for the next write
+            dirty.update(FileStorage.__dirty)
+            FileStorage.__dirty = dirty
+            raise
+
+    def __append_journal(self, dirty):
+        """appends the changes in dirty to the journal"""
+        with open(self.__journal_path(), 'ab') as f:
+            for key, obj in dirty.items():
+                entry = {"key": key}
+                entry["obj"] = obj.to_dict() if obj is not None else None
+                f.write(codec.JSON.dumps(entry) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            FileStorage.__journal_offset = f.tell()
+        FileStorage.__journal_len += len(dirty)
+
+    def __write_snapshot(self):
+        """rewrites the JSON file with every object, and drops the journal
+
+        A plain JSON file is written one class after the other, with the
+        byte range of each class in the index, see __sections(), and that
+        of each object in the record index. The classes that reload() left
+        in the old file and that have no object in memory are copied over
+        from it as they are.
+        """
+        by_class = self.__class_index()
+        deferred = self.__deferred_now()
+        old = None
+        if (deferred and self.__codec.format is None and
+                self.__sections() is not None):
+            old = RecordIndex.open(self.__file_path, self.__ids_path())
+        try:
+            if old is None:
+                self.__load_deferred(deferred)
+            else:
+                self.__load_deferred(name for name in deferred
+                                     if by_class.get(name))
+            groups = {}
+            for key, obj in list(self.__objects.items()):
+                self.__reindex_if_moved(key, obj)
+                name = obj.__class__.__name__
+                groups.setdefault(name, {})[key] = obj.to_dict()
+            if self.__codec.format is None:
+                self.__write_sections(groups, self.__deferred_now(), old)
+            else:
+                json_objects = {}
+                for group in groups.values():
+                    json_objects.update(group)
+                self.__write_file(self.__codec.encode(json_objects))
+                for path in (self.__index_path(), self.__ids_path()):
+                    if os.path.exists(path):
+                        os.remove(path)
+        finally:
+            if old is not None:
+                old.close()
+        self.__close_records()
+        if os.path.exists(self.__journal_path()):
+            os.remove(self.__journal_path())
+        FileStorage.__journal_len = 0
+        FileStorage.__journal_offset = 0
+
+    def __write_sections(self, groups, deferred, old):
+        """writes the JSON file from groups, <class name> -> {key: dict},
+        and the deferred classes copied from the old file, that the record
+        index old goes with, then its index and its record index"""
+        sections = self.__sections() if deferred else {}
+        raw = {}
+        if deferred:
+            old_records = old.records()
+            for name in deferred:
+                if name in sections:
+                    start, end, count = sections[name]
+                    body = os.pread(old.data_file.fileno(), end - start,
+                                    start)
+                    records = [(dg, s - start, e - start)
+                               for dg, s, e in old_records
+                               if start <= s < end]
+                    raw[name] = (body, count, records)
+        parts = []
+        index = {}
+        records = []
+        offset = 1
+        for name in sorted(set(groups) | set(raw)):
+            if name in raw:
+                body, count, section_records = raw[name]
+            else:
+                pieces = []
+                section_records = []
+                start = 0
+                for key, d in groups[name].items():
+                    piece = self.__codec.dumps({key: d})[1:-1]
+                    if pieces:
+                        start += 1
+                    section_records.append(
+                        (digest(key), start, start + len(piece)))
+                    pieces.append(piece)
+                    start += len(piece)
+                body = b",".join(pieces)
+                count = len(groups[name])
+            if parts:
+                offset += 1
+            index[name] = [offset, offset + len(body), count]
+            records.extend((dg, offset + s, offset + e)
+                           for dg, s, e in section_records)
+            parts.append(body)
+            offset += len(body)
+        self.__write_file(b"{" + b",".join(parts) + b"}")
+        stamp = self.__stat()[0]
+        data = codec.JSON.dumps({"stamp": list(stamp), "sections": index})
+        tmp = "{}.{}.tmp".format(self.__index_path(), os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.__index_path())
+        RecordIndex.write(self.__ids_path(), stamp, records)
+
+    def __sections(self):
+        """returns the byte ranges of the classes in the JSON file, as
+        <class name> -> [start, end, count], read from its index; or None
+        if the file cannot be read a class at a time: lazy loading is off,
+        a journal goes with it, or its index is missing or out of date"""
+        if (not self.__lazy or self.__journal or
+                os.path.exists(self.__journal_path())):
+            return None
+        try:
+            with open(self.__index_path(), 'rb') as f:
+                index = codec.JSON.loads(f.read())
+            stamp = self.__stat()[0]
+            if stamp is None or list(stamp) != index["stamp"]:
+                return None
+            return index["sections"]
         except Exception:
+            return None
+
+    def __load_section(self, f, start, end, keep):
+        """loads the objects of the class section between the offsets
+        start and end of the open JSON file f, but for the keys in keep,
+        and returns the keys of the section"""
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            f.seek(start)
+            jo = codec.JSON.loads(b"{" + f.read(end - start) + b"}")
+            for key in jo:
+                if key not in keep:
+                    self.__load(key, jo[key])
+            return jo.keys()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def __deferred_now(self):
+        """returns the names of the classes that reload() left in the file
+        for the current __objects"""
+        if FileStorage.__deferred_for is not FileStorage.__objects:
+            return set()
+        return set(FileStorage.__deferred)
+
+    def __ensure(self, names):
+        """reads the objects of the classes in names that reload() left in
+        the file, see __read()"""
+        if (not FileStorage.__deferred or
+                FileStorage.__deferred_for is not FileStorage.__objects or
+                FileStorage.__deferred.isdisjoint(names)):
+            return
+        with FileStorage.__lock:
+            with self.__locked(False):
+                self.__load_deferred(names)
+
+    def __load_deferred(self, names):
+        """reads the objects of the classes in names that reload() left in
+        the file, or every object if the file can no longer be read a class
+        at a time; the caller holds the lock and the lock file
+
+        The objects already in memory are newer than the file, e.g. saved
+        since, and are kept.
+        """
+        names = set(names) & self.__deferred_now()
+        if not names:
+            return
+        keep = set(self.__objects) | set(self.__dirty)
+        sections = self.__sections()
+        if sections is None:
+            self.__read(keep)
+            return
+        with open(self.__file_path, 'rb') as f:
+            for name in names:
+                if name in sections:
+                    start, end, count = sections[name]
+                    self.__load_section(f, start, end, keep)
+        FileStorage.__deferred = FileStorage.__deferred - names
+        FileStorage.__point_cache = {}
+
+    def __write_file(self, data):
+        """replaces the JSON file with data, atomically: readers and a
+        reload() after a crash find either the old or the new file whole"""
+        tmp = "{}.{}.tmp".format(self.__file_path, os.getpid())
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.__file_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        # make the rename itself durable
+        try:
+            fd = os.open(os.path.dirname(self.__file_path) or ".",
+                         os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
             pass
+        finally:
+            os.close(fd)
+
+    def reload(self):
+        """deserializes the JSON file and replays the journal to __objects
+
+        In compact mode the objects are kept in the ColumnStore of their
+        class, and an object already loaded is updated in place. Unless
+        HBNB_FILE_LAZY is 0, a class without objects in memory is only read
+        from the file when it is first used, see __read().
+        """
+        with FileStorage.__lock:
+            # the file is about to be read back, write pending saves first
+            self.flush()
+            with self.__locked(False) as f:
+                FileStorage.__generation = self.__generation_of(f)
+                self.__read()
+
+    def __read(self, keep=()):
+        """loads the file and the journal into __objects, but for the keys
+        in keep, and returns the set of keys they hold, see reload()
+
+        When the file can be read a class at a time, see __sections(), only
+        the classes that have objects in memory or keys in keep are read:
+        the others are left in the file until they are first used, by all(),
+        count() and the other readers, and their keys are not returned;
+        get() reads just the object it is asked for, see __point_get().
+        """
+        # every object built here is kept: pause the cycle collector, that
+        # would otherwise walk the growing store over and over
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.__close_records()
+            FileStorage.__file_stamp = self.__stat()
+            present = set()
+            sections = self.__sections()
+            deferred = set()
+            try:
+                with open(self.__file_path, 'rb') as f:
+                    if sections is None:
+                        data = f.read()
+                        jo = codec.decode(data) if data.strip() else {}
+                        for key in jo:
+                            present.add(key)
+                            if key not in keep:
+                                self.__load(key, jo[key])
+                    else:
+                        by_class = self.__class_index()
+                        # a class with changes not written yet is read too:
+                        # deferred, its old section would be copied back
+                        # over them, a deleted object with it
+                        pending = {key.split('.', 1)[0] for key in keep}
+                        for name, (start, end, count) in sections.items():
+                            if by_class.get(name) or name in pending:
+                                present.update(self.__load_section(
+                                    f, start, end, keep))
+                            else:
+                                deferred.add(name)
+            except FileNotFoundError:
+                # nothing saved yet; a file that cannot be decoded raises
+                # instead, rather than being taken for an empty store that
+                # the next save() would overwrite
+                pass
+            FileStorage.__deferred = deferred
+            FileStorage.__deferred_for = FileStorage.__objects
+            FileStorage.__journal_len = 0
+            FileStorage.__journal_offset = 0
+            self.__replay(present, keep)
+            return present
+        finally:
+            if enabled:
+                gc.enable()
+
+    def __replay(self, present, keep):
+        """replays the journal entries past __journal_offset, but for the
+        keys in keep, and updates the set of keys present to match"""
+        try:
+            with open(self.__journal_path(), 'rb') as f:
+                f.seek(FileStorage.__journal_offset)
+                data = f.read()
+        except OSError:
+            return
+        # a line without its newline is still being written
+        end = data.rfind(b"\n") + 1
+        FileStorage.__journal_offset += end
+        for line in data[:end].splitlines():
+            try:
+                entry = codec.JSON.loads(line)
+                key, jo = entry["key"], entry["obj"]
+                if jo is None:
+                    present.discard(key)
+                    if key not in keep:
+                        self.__drop(key)
+                else:
+                    present.add(key)
+                    if key not in keep:
+                        self.__load(key, jo)
+            except Exception:
+                continue
+            FileStorage.__journal_len += 1
+
+    def __sync(self, keep, prune):
+        """catches up with the file written by another process, but for the
+        keys in keep, whose changes are not written yet
+
+        When only the journal grew its new entries are replayed, otherwise
+        everything is read again, and with prune the objects missing from
+        the file are dropped.
+        """
+        old, stamp = FileStorage.__file_stamp, self.__stat()
+        if stamp == old:
+            return
+        if (old is not None and old[0] == stamp[0] and
+                stamp[1] is not None and
+                (old[1] is None or old[1][0] == stamp[1][0]) and
+                stamp[1][1] >= FileStorage.__journal_offset):
+            self.__replay(set(), keep)
+            FileStorage.__file_stamp = self.__stat()
+            return
+        present = self.__read(keep)
+        if prune:
+            for key in set(self.__objects) - present - set(keep):
+                self.__drop(key)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            self.__ensure((obj.__class__.__name__,))
+            with FileStorage.__lock:
+                if self.__drop(key) is not None:
+                    self.__dirty[key] = None
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """catches up with the JSON file if another process wrote it, or if
+        it changed, since this process last read or wrote it"""
+        if (self.__generation_of() == FileStorage.__generation and
+                self.__stat() == FileStorage.__file_stamp):
+            return
+        with FileStorage.__lock:
+            with self.__locked(False) as f:
+                generation = self.__generation_of(f)
+                last = FileStorage.__generation
+                if (generation != last or
+                        self.__stat() != FileStorage.__file_stamp):
+                    prune = last is not None and last[0] == generation[0]
+                    self.__sync(self.__dirty, prune)
+                    FileStorage.__generation = generation
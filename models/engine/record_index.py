@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the RecordIndex class, the memory-mapped index of the byte range
+of each object in the JSON file, that FileStorage.get() reads a single
+object through while its class is still left in the file
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+# starts the index file, followed by the stamp of the JSON file it indexes
+MAGIC = b"HBNBIDS1"
+HEADER = struct.Struct("<8sQQQ")
+# digest of the <class name>.<id> key, start and end offsets in the file
+RECORD = struct.Struct("<16sQQ")
+
+
+def digest(key):
+    """returns the 16 byte digest the key of an object is indexed by"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def stamp_of(st):
+    """returns the (inode, size, mtime) stamp of the os.stat() result st"""
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class RecordIndex:
+    """An open JSON file and the index of its objects, mapped in memory.
+
+    The index holds a header with the stamp of the JSON file, then one
+    RECORD per object sorted by digest, so that a lookup is a binary
+    search of the mapped file. The file is kept open: it is the one the
+    index was checked against, even after the path is replaced.
+    """
+
+    def __init__(self, data_file, index_map):
+        """initializes the index of the open data_file mapped in index_map"""
+        self.data_file = data_file
+        self.map = index_map
+        self.count = (len(index_map) - HEADER.size) // RECORD.size
+
+    @classmethod
+    def open(cls, path, index_path):
+        """returns the index of the JSON file path kept at index_path, or
+        None if it is missing or indexes another version of the file"""
+        try:
+            data_file = open(path, 'rb')
+        except OSError:
+            return None
+        try:
+            with open(index_path, 'rb') as index_file:
+                index_map = mmap.mmap(index_file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            data_file.close()
+            return None
+        stamp = stamp_of(os.fstat(data_file.fileno()))
+        if (len(index_map) < HEADER.size or
+                HEADER.unpack_from(index_map) != (MAGIC,) + stamp):
+            index_map.close()
+            data_file.close()
+            return None
+        return cls(data_file, index_map)
+
+    @staticmethod
+    def write(index_path, stamp, records):
+        """writes at index_path the index of records, (digest, start, end)
+        tuples, for the JSON file stamped stamp"""
+        records = sorted(records)
+        data = bytearray(HEADER.size + RECORD.size * len(records))
+        HEADER.pack_into(data, 0, MAGIC, *stamp)
+        for i, record in enumerate(records):
+            RECORD.pack_into(data, HEADER.size + i * RECORD.size, *record)
+        tmp = "{}.{}.tmp".format(index_path, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, index_path)
+
+    def records(self):
+        """returns the list of the (digest, start, end) records"""
+        return list(RECORD.iter_unpack(self.map[HEADER.size:]))
+
+    def lookup(self, key):
+        """returns the bytes of the "<key>": {...} record of key in the
+        JSON file, or None if it is not indexed"""
+        target = digest(key)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * RECORD.size
+            found = self.map[offset:offset + 16]
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                start, end = RECORD.unpack_from(self.map, offset)[1:]
+                return os.pread(self.data_file.fileno(), end - start, start)
+        return None
+
+    def close(self):
+        """closes the mapped index and the JSON file"""
+        self.map.close()
+        self.data_file.close()
@@ -0,0 +1,17 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from os import getenv, path
+from models.engine.db_storage import DBStorage
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with a local SQLite database file, through the same
+    models and queries as DBStorage, in write-ahead logging mode"""
+
+    def __init__(self):
+        """Instantiate a SQLiteStorage object on HBNB_SQLITE_PATH"""
+        db_path = path.abspath(getenv('HBNB_SQLITE_PATH', 'hbnb.db'))
+        super().__init__('sqlite:///' + db_path)
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Contains isolated() and isolate(), that give a test a FileStorage of its
+own: an empty store in a temporary directory, with every class attribute
+of FileStorage put back as it was once the test is done
+"""
+
+from contextlib import contextmanager, ExitStack
+import models
+from models.engine.file_storage import FileStorage
+import os
+import tempfile
+
+PREFIX = "_FileStorage__"
+# class attributes that describe the store rather than configure it, and
+# the value each one starts with for an empty store
+EMPTY = {"objects": dict, "by_class": dict, "by_fk": dict,
+         "fk_values": dict, "sorted_keys": dict, "indexed": None,
+         "file_stamp": None, "journal_len": 0, "dirty": dict,
+         "stores": dict, "timer": None, "generation": None,
+         "journal_offset": 0, "batch": None, "batch_saved": False,
+         "class_generations": dict, "deferred": set, "deferred_for": None,
+         "records": None, "point_cache": dict}
+
+
+def state():
+    """returns the data attributes of FileStorage, by mangled name"""
+    return {name: value for name, value in vars(FileStorage).items()
+            if name.startswith(PREFIX) and not callable(value) and
+            not isinstance(value, (staticmethod, classmethod))}
+
+
+@contextmanager
+def isolated(**settings):
+    """runs the block with an empty FileStorage in a temporary directory,
+    configured by settings such as lazy=True or journal_max=4, and yields
+    the path of its JSON file; FileStorage is restored at the end"""
+    saved = state()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "file.json")
+            setattr(FileStorage, PREFIX + "file_path", path)
+            for name, empty in EMPTY.items():
+                setattr(FileStorage, PREFIX + name,
+                        empty() if callable(empty) else empty)
+            for name, value in settings.items():
+                setattr(FileStorage, PREFIX + name, value)
+            try:
+                yield path
+            finally:
+                timer = getattr(FileStorage, PREFIX + "timer")
+                if timer is not None:
+                    timer.cancel()
+                records = getattr(FileStorage, PREFIX + "records")
+                if records is not None:
+                    records.close()
+    finally:
+        for name in set(state()) - set(saved):
+            delattr(FileStorage, name)
+        for name, value in saved.items():
+            setattr(FileStorage, name, value)
+
+
+def isolate(test, **settings):
+    """isolates FileStorage, see isolated(), until the unittest test ends;
+    returns the path of its JSON file, or None with DB storage"""
+    if models.storage_t == 'db':
+        return None
+    stack = ExitStack()
+    test.addCleanup(stack.close)
+    return stack.enter_context(isolated(**settings))
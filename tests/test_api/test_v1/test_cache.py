@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs and TestCache classes
+"""
+
+from api.v1 import cache
+from api.v1.app import app
+import models
+from models import storage
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+from tests.isolation import isolate
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the cache module"""
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test that tests/test_api/test_v1/test_cache.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the cache.py module and ResponseCache docstrings"""
+        self.assertIsNot(cache.__doc__, None, "cache.py needs a docstring")
+        self.assertTrue(len(cache.ResponseCache.__doc__) >= 1,
+                        "ResponseCache needs a docstring")
+
+
+class TestCache(unittest.TestCase):
+    """Test the response cache of the list views"""
+
+    def setUp(self):
+        """Give each test an empty store and an empty cache"""
+        isolate(self)
+        self.client = app.test_client()
+        self.state = State(name="North")
+        self.state.save()
+        cache.responses.clear()
+
+    def tearDown(self):
+        """Restore the store"""
+        cache.responses.clear()
+
+    def stats(self):
+        """returns the (hits, misses) counters, read through the API"""
+        stats = self.client.get('/api/v1/stats/cache').get_json()
+        return stats['hits'], stats['misses']
+
+    def test_hit(self):
+        """Test that a list is replayed without reading the storage"""
+        first = self.client.get('/api/v1/states')
+        with mock.patch.object(type(storage), 'page',
+                               side_effect=AssertionError):
+            second = self.client.get('/api/v1/states')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(self.stats(), (1, 1))
+
+    def test_invalidation(self):
+        """Test that a change to a listed class makes the entry stale"""
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        self.assertEqual(self.client.get(url).get_json(), [])
+        City(name="Kano", state_id=self.state.id).save()
+        self.assertEqual(len(self.client.get(url).get_json()), 1)
+        self.assertEqual(self.stats(), (0, 2))
+        self.client.get(url)
+        self.client.put('/api/v1/states/{}'.format(self.state.id),
+                        json={"name": "Far North"})
+        self.client.get(url)
+        self.assertEqual(self.stats(), (1, 3))
+
+    def test_arguments(self):
+        """Test that each set of arguments has its own entry"""
+        State(name="South").save()
+        first = self.client.get('/api/v1/states?limit=1')
+        self.assertIn('Link', first.headers)
+        self.client.get('/api/v1/states')
+        again = self.client.get('/api/v1/states?limit=1')
+        self.assertEqual(again.headers['Link'], first.headers['Link'])
+        self.assertEqual(self.stats(), (1, 2))
+
+    def test_lru_and_ttl(self):
+        """Test that entries are evicted when full and expire"""
+        with mock.patch.object(cache, 'CACHE_SIZE', 1):
+            self.client.get('/api/v1/states?limit=1')
+            self.client.get('/api/v1/states?limit=2')
+            self.client.get('/api/v1/states?limit=1')
+            self.assertEqual(self.stats(), (0, 3))
+        with mock.patch.object(cache, 'monotonic',
+                               return_value=cache.monotonic() + 10 ** 6):
+            self.client.get('/api/v1/states?limit=1')
+        self.assertEqual(self.stats(), (0, 4))
+        with mock.patch.object(cache, 'CACHE_SIZE', 0):
+            self.client.get('/api/v1/states?limit=1')
+            self.client.get('/api/v1/states?limit=1')
+        self.assertEqual(self.stats(), (0, 4))
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompressionDocs and TestCompression classes
+"""
+
+from api.v1 import compression
+from api.v1.app import app
+import gzip
+import json
+import models
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+from tests.isolation import isolate
+
+
+class TestCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the compression
+    module"""
+
+    def test_pep8_conformance_compression(self):
+        """Test that api/v1/compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compression(self):
+        """Test that tests/test_api/test_v1/test_compression.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compression_module_docstring(self):
+        """Test for the compression.py module docstring"""
+        self.assertIsNot(compression.__doc__, None,
+                         "compression.py needs a docstring")
+        self.assertTrue(len(compression.compress.__doc__) >= 1,
+                        "compress needs a docstring")
+
+
+class TestCompression(unittest.TestCase):
+    """Test the compression of the API responses"""
+
+    def setUp(self):
+        """Give each test a store holding enough states for a large list"""
+        isolate(self)
+        self.client = app.test_client()
+        for i in range(20):
+            models.storage.new(State(name="State {}".format(i)))
+        models.storage.save()
+        self.url = '/api/v1/states?limit=20'
+
+    def get(self, url, encoding, **headers):
+        """returns the response to GET url accepting encoding"""
+        headers['Accept-Encoding'] = encoding
+        return self.client.get(url, headers=headers)
+
+    def test_gzip(self):
+        """Test that a large list is gzipped with a weak ETag"""
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('Accept-Encoding', plain.headers['Vary'])
+        resp = self.get(self.url, 'gzip')
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', resp.headers['Vary'])
+        self.assertLess(len(resp.data), len(plain.data))
+        self.assertEqual(json.loads(gzip.decompress(resp.data)),
+                         plain.get_json())
+        self.assertEqual(int(resp.headers['Content-Length']),
+                         len(resp.data))
+        etag = resp.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        again = self.get(self.url, 'gzip', **{'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+
+    def test_small_response(self):
+        """Test that a response under MIN_SIZE is sent as it is"""
+        resp = self.get('/api/v1/status', 'gzip')
+        self.assertNotIn('Content-Encoding', resp.headers)
+        with mock.patch.object(compression, 'MIN_SIZE', 10 ** 9):
+            resp = self.get(self.url, 'gzip')
+        self.assertNotIn('Content-Encoding', resp.headers)
+
+    def test_negotiation(self):
+        """Test that the encoding follows the Accept-Encoding qualities"""
+        resp = self.get(self.url, 'identity')
+        self.assertNotIn('Content-Encoding', resp.headers)
+        resp = self.get(self.url, 'gzip;q=1.0, br;q=0.5')
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        resp = self.get(self.url, 'gzip, br')
+        self.assertEqual(resp.headers['Content-Encoding'],
+                         'br' if compression.brotli else 'gzip')
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        """Test that brotli is used when the client prefers it"""
+        plain = self.client.get(self.url)
+        resp = self.get(self.url, 'br')
+        self.assertEqual(resp.headers['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(compression.brotli.decompress(resp.data)),
+                         plain.get_json())
+
+    def test_compressed_bodies_are_reused(self):
+        """Test that an identical body is only compressed once"""
+        gzip_body = compression.encoders['gzip']
+        with mock.patch.dict(compression.encoders) as encoders:
+            encoders['gzip'] = mock.Mock(side_effect=gzip_body)
+            first = self.get(self.url, 'gzip')
+            second = self.get(self.url, 'gzip')
+            self.assertEqual(encoders['gzip'].call_count, 1)
+        self.assertEqual(first.data, second.data)
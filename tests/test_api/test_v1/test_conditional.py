@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from api.v1 import conditional
+from api.v1.app import app
+import models
+from models import storage
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+from tests.isolation import isolate
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the conditional
+    module"""
+
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_conditional(self):
+        """Test that tests/test_api/test_v1/test_conditional.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_module_docstring(self):
+        """Test for the conditional.py module docstring"""
+        self.assertIsNot(conditional.__doc__, None,
+                         "conditional.py needs a docstring")
+        self.assertTrue(len(conditional.conditional.__doc__) >= 1,
+                        "conditional needs a docstring")
+
+
+class TestConditional(unittest.TestCase):
+    """Test the ETag, Last-Modified and Cache-Control of the GET views"""
+
+    def setUp(self):
+        """Give each test an empty store in a temporary file"""
+        isolate(self)
+        self.client = app.test_client()
+        self.state = State(name="North")
+        self.state.save()
+
+    def test_collection(self):
+        """Test that a list is only sent again once its class changed"""
+        first = self.client.get('/api/v1/states')
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        self.assertIn('public', first.headers['Cache-Control'])
+        with mock.patch.object(type(storage), 'page',
+                               side_effect=AssertionError):
+            again = self.client.get('/api/v1/states',
+                                    headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b'')
+        self.assertEqual(again.headers['ETag'], etag)
+        City(name="Kano", state_id=self.state.id).save()
+        again = self.client.get('/api/v1/states',
+                                headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        State(name="South").save()
+        changed = self.client.get('/api/v1/states',
+                                  headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+    def test_nested_collection(self):
+        """Test that a nested list changes with its parent and children"""
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        etag = self.client.get(url).headers['ETag']
+        City(name="Kano", state_id=self.state.id).save()
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.get_json()), 1)
+        etag = resp.headers['ETag']
+        self.client.delete('/api/v1/cities/{}'.format(
+            resp.get_json()[0]['id']))
+        self.client.delete('/api/v1/states/{}'.format(self.state.id))
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 404)
+        self.assertNotIn('ETag', resp.headers)
+
+    def test_object(self):
+        """Test that an object is tagged with a hash of its JSON"""
+        url = '/api/v1/states/{}'.format(self.state.id)
+        first = self.client.get(url)
+        etag = first.headers['ETag']
+        self.assertIn('Last-Modified', first.headers)
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(url, headers={
+            'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(resp.status_code, 304)
+        State(name="South").save()
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+        self.client.put(url, json={"name": "Far North"})
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['name'], "Far North")
+        self.assertNotEqual(resp.headers['ETag'], etag)
+
+    def test_object_same_updated_at(self):
+        """Test that an object changed without a new updated_at, as within
+        one second on MySQL, gets a new ETag"""
+        url = '/api/v1/states/{}'.format(self.state.id)
+        etag = self.client.get(url).headers['ETag']
+        state = storage.get(State, self.state.id)
+        state.name = "Far North"
+        storage.new(state)
+        storage.save()
+        resp = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['name'], "Far North")
+        self.assertNotEqual(resp.headers['ETag'], etag)
+
+    def test_max_age(self):
+        """Test that HBNB_API_MAX_AGE sets the Cache-Control max-age"""
+        with mock.patch.object(conditional, 'MAX_AGE', 30):
+            resp = self.client.get('/api/v1/states')
+        self.assertIn('max-age=30', resp.headers['Cache-Control'])
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1 import pagination
+from api.v1.app import app
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+from tests.isolation import isolate
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the pagination module"""
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test that tests/test_api/test_v1/test_pagination.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.paginate.__doc__) >= 1,
+                        "paginate needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPagination(unittest.TestCase):
+    """Test the paginated list endpoints"""
+
+    def setUp(self):
+        """Give each test an empty store in a temporary file"""
+        isolate(self)
+        self.client = app.test_client()
+
+    def test_pages_follow_next_link(self):
+        """Test that following the Link headers returns every object once"""
+        for i in range(7):
+            models.storage.new(State(name=str(i)))
+        ids = sorted(models.storage.all(State).keys())
+        seen = []
+        url = '/api/v1/states?limit=3'
+        pages = 0
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertLessEqual(len(resp.get_json()), 3)
+            seen += ["State." + obj['id'] for obj in resp.get_json()]
+            link = resp.headers.get('Link')
+            url = link[1:link.index('>')] if link else None
+            pages += 1
+        self.assertEqual(seen, ids)
+        self.assertEqual(pages, 3)
+
+    def test_filtered_pages(self):
+        """Test that nested lists are filtered and paginated"""
+        state, other = State(name='Lagos'), State(name='Kano')
+        models.storage.new(state)
+        models.storage.new(other)
+        cities = [City(name=str(i), state_id=state.id) for i in range(4)]
+        for city in cities + [City(name='x', state_id=other.id)]:
+            models.storage.new(city)
+        url = '/api/v1/states/{}/cities?limit=2'.format(state.id)
+        first = self.client.get(url)
+        self.assertEqual(len(first.get_json()), 2)
+        link = first.headers['Link']
+        second = self.client.get(link[1:link.index('>')])
+        self.assertNotIn('Link', second.headers)
+        got = [c['id'] for c in first.get_json() + second.get_json()]
+        self.assertEqual(got, sorted(c.id for c in cities))
+
+    def test_limit_is_capped_and_checked(self):
+        """Test that limit is capped at MAX_PAGE_SIZE and must be positive"""
+        for i in range(3):
+            models.storage.new(State(name=str(i)))
+        save = pagination.MAX_PAGE_SIZE
+        pagination.MAX_PAGE_SIZE = 2
+        try:
+            resp = self.client.get('/api/v1/states?limit=50')
+            self.assertEqual(len(resp.get_json()), 2)
+            self.assertIn('Link', resp.headers)
+            resp = self.client.get('/api/v1/states')
+            self.assertEqual(len(resp.get_json()), 2)
+        finally:
+            pagination.MAX_PAGE_SIZE = save
+        self.assertEqual(self.client.get(
+            '/api/v1/states?limit=0').status_code, 400)
+        self.assertEqual(self.client.get(
+            '/api/v1/states?limit=abc').status_code, 400)
+
+    def test_stream(self):
+        """Test that stream=1 returns the whole ordered list in chunks"""
+        save = pagination.STREAM_CHUNK_SIZE
+        pagination.STREAM_CHUNK_SIZE = 2
+        try:
+            resp = self.client.get('/api/v1/states?stream=1')
+            self.assertEqual(resp.get_json(), [])
+            for i in range(5):
+                models.storage.new(State(name=str(i)))
+            resp = self.client.get('/api/v1/states?stream=1&limit=1')
+            self.assertTrue(resp.is_streamed)
+            self.assertNotIn('Link', resp.headers)
+            expected = sorted(models.storage.all(State).values(),
+                              key=lambda state: state.id)
+            self.assertEqual([s['id'] for s in resp.get_json()],
+                             [state.id for state in expected])
+        finally:
+            pagination.STREAM_CHUNK_SIZE = save
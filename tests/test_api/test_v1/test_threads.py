@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Contains the TestThreadedTraffic class
+"""
+
+from api.v1.app import app
+import json
+import models
+from models.state import State
+import pep8
+import random
+import sys
+import threading
+import unittest
+from tests.isolation import isolate
+
+THREADS = 8
+REQUESTS = 60
+
+
+class TestThreadsDocs(unittest.TestCase):
+    """Tests to check the style of the threaded traffic tests"""
+
+    def test_pep8_conformance_test_threads(self):
+        """Test that tests/test_api/test_v1/test_threads.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_threads.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestThreadedTraffic(unittest.TestCase):
+    """Test FileStorage under concurrent API requests"""
+
+    def setUp(self):
+        """Use an empty store in a temporary file"""
+        self.path = isolate(self)
+        for i in range(20):
+            State(name="seed {}".format(i)).save()
+
+    def traffic(self, seed, statuses):
+        """sends REQUESTS mixed requests, recording the response codes"""
+        rand = random.Random(seed)
+        client = app.test_client()
+        for i in range(REQUESTS):
+            ids = [key.split(".")[1] for key in models.storage.all(State)]
+            state_id = rand.choice(ids) if ids else "none"
+            op = rand.choice(("list", "get", "post", "put", "delete"))
+            if op == "list":
+                resp = client.get('/api/v1/states?limit=5')
+            elif op == "get":
+                resp = client.get('/api/v1/states/' + state_id)
+            elif op == "post":
+                resp = client.post('/api/v1/states',
+                                   json={"name": "t{}-{}".format(seed, i)})
+            elif op == "put":
+                resp = client.put('/api/v1/states/' + state_id,
+                                  json={"name": "put {}".format(i)})
+            else:
+                resp = client.delete('/api/v1/states/' + state_id)
+            statuses.append((op, resp.status_code))
+
+    def test_mixed_traffic(self):
+        """test that concurrent GET/PUT/POST/DELETE never fail or lose
+        writes"""
+        statuses = []
+        threads = [threading.Thread(target=self.traffic, args=(n, statuses))
+                   for n in range(THREADS)]
+        # switch threads as often as possible to interleave the requests
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(len(statuses), THREADS * REQUESTS)
+        for op, status in statuses:
+            self.assertIn(status, (200, 201, 404), op)
+        models.storage.flush()
+        with open(self.path) as f:
+            saved = json.loads(f.read())
+        self.assertEqual(set(saved), set(models.storage.all(State)))
+        self.assertEqual(len(models.storage.page(State, 1000)),
+                         models.storage.count(State))
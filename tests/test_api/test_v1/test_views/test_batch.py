@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatch class
+"""
+
+from api.v1.app import app
+import models
+from models import storage
+from models.city import City
+from models.state import State
+from models.engine.file_storage import FileStorage
+import pep8
+import unittest
+from unittest import mock
+from tests.isolation import isolate
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the style of the batch view"""
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_batch(self):
+        """Test that tests/test_api/test_v1/test_views/test_batch.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestBatch(unittest.TestCase):
+    """Test POST /api/v1/batch"""
+
+    def setUp(self):
+        """Build a state with a city, and a state without any"""
+        isolate(self)
+        self.client = app.test_client()
+        self.state = State(name="North")
+        self.state.save()
+        self.city = City(name="Kano", state_id=self.state.id)
+        self.city.save()
+        self.empty = State(name="Empty")
+        self.empty.save()
+
+    def batch(self, ops):
+        """returns the results of the batch ops"""
+        resp = self.client.post('/api/v1/batch', json=ops)
+        self.assertEqual(resp.status_code, 200)
+        return resp.get_json()
+
+    def test_create_update_delete(self):
+        """Test that every operation is applied and reported in order"""
+        results = self.batch([
+            {"op": "create", "class": "State", "data": {"name": "South"}},
+            {"op": "update", "class": "City", "id": self.city.id,
+             "data": {"name": "Kaduna", "state_id": "x"}},
+            {"op": "delete", "class": "State", "id": self.empty.id}])
+        self.assertEqual([r["status"] for r in results], [201, 200, 200])
+        south = storage.get(State, results[0]["object"]["id"])
+        self.assertEqual(south.name, "South")
+        self.assertEqual(results[1]["object"]["name"], "Kaduna")
+        city = storage.get(City, self.city.id)
+        self.assertEqual((city.name, city.state_id),
+                         ("Kaduna", self.state.id))
+        self.assertIsNone(storage.get(State, self.empty.id))
+
+    def test_refer_to_created(self):
+        """Test that an operation can use an object created before it"""
+        results = self.batch([
+            {"op": "create", "class": "State",
+             "data": {"id": "batch-state", "name": "West"}},
+            {"op": "create", "class": "City",
+             "data": {"name": "Oyo", "state_id": "batch-state"}},
+            {"op": "update", "class": "State", "id": "batch-state",
+             "data": {"name": "Far West"}}])
+        self.assertEqual([r["status"] for r in results], [201, 201, 200])
+        city = storage.get(City, results[1]["object"]["id"])
+        self.assertEqual(city.state_id, "batch-state")
+        self.assertEqual(storage.get(State, "batch-state").name, "Far West")
+
+    def test_errors(self):
+        """Test that failed operations are reported and change nothing"""
+        counts = (storage.count(State), storage.count(City))
+        results = self.batch([
+            {"op": "create", "class": "State", "data": {}},
+            {"op": "create", "class": "City",
+             "data": {"name": "Nowhere", "state_id": "missing"}},
+            {"op": "update", "class": "City", "id": "missing", "data": {}},
+            {"op": "delete", "class": "Nope", "id": self.city.id},
+            {"op": "rename", "class": "City", "id": self.city.id}])
+        self.assertEqual([r["status"] for r in results],
+                         [400, 404, 404, 400, 400])
+        self.assertEqual(results[0]["error"], "Missing name")
+        self.assertEqual((storage.count(State), storage.count(City)),
+                         counts)
+
+    def test_bad_body(self):
+        """Test that a body that is not a JSON list is refused"""
+        resp = self.client.post('/api/v1/batch', data="nope")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post('/api/v1/batch', json={"op": "create"})
+        self.assertEqual(resp.status_code, 400)
+        with mock.patch('api.v1.views.batch.MAX_BATCH', 1):
+            resp = self.client.post('/api/v1/batch', json=[{}, {}])
+        self.assertEqual(resp.status_code, 400)
+
+    def test_single_save(self):
+        """Test that the whole batch is written at once"""
+        ops = [{"op": "create", "class": "State",
+                "data": {"name": str(i)}} for i in range(20)]
+        ops.append({"op": "update", "class": "State", "id": self.state.id,
+                    "data": {"name": "Renamed"}})
+        if models.storage_t == 'db':
+            session = storage._DBStorage__session
+            write = mock.patch.object(session, 'commit',
+                                      side_effect=session.commit)
+        else:
+            write = mock.patch.object(
+                FileStorage, '_FileStorage__write', autospec=True,
+                side_effect=FileStorage._FileStorage__write)
+        with write as written:
+            self.batch(ops)
+        self.assertEqual(written.call_count, 1)
+        self.assertEqual(storage.get(State, self.state.id).name, "Renamed")
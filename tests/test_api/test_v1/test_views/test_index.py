@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestPoolStats classes
+"""
+
+from api.v1.app import app
+import models
+import pep8
+import unittest
+from tests.isolation import isolate
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the style of the index views"""
+
+    def test_pep8_conformance_index(self):
+        """Test that api/v1/views/index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_index(self):
+        """Test that tests/test_api/test_v1/test_views/test_index.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestPoolStats(unittest.TestCase):
+    """Test GET /api/v1/stats/pool"""
+
+    def setUp(self):
+        """Give each test an empty store"""
+        isolate(self)
+        self.client = app.test_client()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that the pool metrics of the database are returned"""
+        resp = self.client.get('/api/v1/stats/pool')
+        self.assertEqual(resp.status_code, 200)
+        stats = resp.get_json()
+        self.assertEqual(set(stats), set(models.storage.pool_stats()))
+        self.assertIn('status', stats)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_no_pool(self):
+        """Test that file storage, without a pool, answers 404"""
+        resp = self.client.get('/api/v1/stats/pool')
+        self.assertEqual(resp.status_code, 404)
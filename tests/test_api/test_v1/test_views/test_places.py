@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesSearch class
+"""
+
+from api.v1.app import app
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from tests.isolation import isolate
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the style of the places view"""
+
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test that tests/test_api/test_v1/test_views/test_places.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test POST /api/v1/places_search"""
+
+    def setUp(self):
+        """Build two states, three cities, four places and two amenities"""
+        isolate(self)
+        self.client = app.test_client()
+        user = self.add(User, email="a@b.c", password="pwd")
+        self.north = self.add(State, name="North")
+        self.south = self.add(State, name="South")
+        self.kano = self.add(City, name="Kano", state_id=self.north.id)
+        self.kaduna = self.add(City, name="Kaduna", state_id=self.north.id)
+        self.lagos = self.add(City, name="Lagos", state_id=self.south.id)
+        self.places = {}
+        for name, city in (("hut", self.kano), ("villa", self.kano),
+                           ("flat", self.kaduna), ("loft", self.lagos)):
+            self.places[name] = self.add(Place, name=name, city_id=city.id,
+                                         user_id=user.id)
+        self.wifi = self.add(Amenity, name="Wifi")
+        self.pool = self.add(Amenity, name="Pool")
+        for place, amenity in (("villa", self.wifi), ("villa", self.pool),
+                               ("loft", self.wifi), ("hut", self.pool)):
+            self.client.post('/api/v1/places/{}/amenities/{}'.format(
+                self.places[place].id, amenity.id))
+
+    def add(self, cls, **kwargs):
+        """creates and saves a cls object"""
+        obj = cls(**kwargs)
+        obj.save()
+        return obj
+
+    def search(self, url='/api/v1/places_search', **body):
+        """returns the sorted names of the places found for body"""
+        resp = self.client.post(url, json=body)
+        self.assertEqual(resp.status_code, 200)
+        return sorted(place['name'] for place in resp.get_json())
+
+    def test_locations(self):
+        """Test that states and cities select the places located there"""
+        self.assertEqual(self.search(states=[self.north.id]),
+                         ["flat", "hut", "villa"])
+        self.assertEqual(self.search(cities=[self.lagos.id]), ["loft"])
+        self.assertEqual(self.search(states=[self.south.id],
+                                     cities=[self.kaduna.id]),
+                         ["flat", "loft"])
+
+    def test_amenities(self):
+        """Test that a place must have every amenity asked for"""
+        self.assertEqual(self.search(amenities=[self.wifi.id]),
+                         ["loft", "villa"])
+        self.assertEqual(self.search(amenities=[self.wifi.id, self.pool.id]),
+                         ["villa"])
+        self.assertEqual(self.search(states=[self.north.id],
+                                     amenities=[self.pool.id]),
+                         ["hut", "villa"])
+        self.assertEqual(self.search(cities=[self.kaduna.id],
+                                     amenities=[self.pool.id]), [])
+
+    def test_no_filters(self):
+        """Test that an empty search returns every place"""
+        names = self.search()
+        for name in self.places:
+            self.assertIn(name, names)
+
+    def test_paginated(self):
+        """Test that search results are paginated by id"""
+        url = '/api/v1/places_search?limit=2'
+        body = {"states": [self.north.id, self.south.id]}
+        first = self.client.post(url, json=body)
+        self.assertEqual(len(first.get_json()), 2)
+        link = first.headers['Link']
+        second = self.client.post(link[1:link.index('>')], json=body)
+        self.assertNotIn('Link', second.headers)
+        ids = [p['id'] for p in first.get_json() + second.get_json()]
+        self.assertEqual(ids, sorted(p.id for p in self.places.values()))
+
+    def test_bad_body(self):
+        """Test that a body that is not a JSON object is refused"""
+        resp = self.client.post('/api/v1/places_search', data="nope")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post('/api/v1/places_search', json=[1])
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post('/api/v1/places_search',
+                                json={"states": "x"})
+        self.assertEqual(resp.status_code, 400)
+        for ids in ([{"a": 1}], [["x"]], [1], [None]):
+            for key in ("states", "cities", "amenities"):
+                resp = self.client.post('/api/v1/places_search',
+                                        json={key: ids})
+                self.assertEqual(resp.status_code, 400)
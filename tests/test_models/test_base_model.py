@@ -158,3 +158,33 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_format_round_trip(self):
+        """test that datetimes keep the %Y-%m-%dT%H:%M:%S.%f format"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        whole = datetime(2017, 6, 14, 22, 31, 3)
+        inst = BaseModel(created_at=whole.strftime(t_format),
+                         updated_at="2017-06-14T22:31:03.285259")
+        self.assertEqual(inst.created_at, whole)
+        self.assertEqual(inst.updated_at,
+                         datetime(2017, 6, 14, 22, 31, 3, 285259))
+        d = inst.to_dict()
+        self.assertEqual(d["created_at"], "2017-06-14T22:31:03.000000")
+        self.assertEqual(d["updated_at"], "2017-06-14T22:31:03.285259")
+
+    @unittest.skipIf(models.storage_t == 'db', "to_dict is not cached")
+    def test_to_dict_cache(self):
+        """test that to_dict is cached until an attribute is set or
+        deleted"""
+        inst = BaseModel()
+        first = inst.to_dict()
+        first["name"] = "not stored"
+        self.assertNotIn("name", inst.to_dict())
+        self.assertIsNot(inst.to_dict(), inst.to_dict())
+        inst.name = "Holberton"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        self.assertNotIn("_BaseModel__to_dict", inst.__dict__)
+        del inst.name
+        self.assertNotIn("name", inst.to_dict())
+        with self.assertRaises(AttributeError):
+            del inst.name
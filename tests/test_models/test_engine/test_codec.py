@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the TestCodecDocs and TestCodec classes
+"""
+
+import inspect
+import json
+from models.engine import codec
+import pep8
+import unittest
+
+
+class TestCodecDocs(unittest.TestCase):
+    """Tests to check the documentation and style of codec.py"""
+
+    def test_pep8_conformance(self):
+        """Test that codec.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/codec.py',
+            'tests/test_models/test_engine/test_codec.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test for the presence of docstrings in the module"""
+        self.assertTrue(codec.__doc__, "codec.py needs a docstring")
+        for name, func in inspect.getmembers(codec, inspect.isfunction):
+            self.assertTrue(func.__doc__,
+                            "{:s} function needs a docstring".format(name))
+        for cls in (codec.JsonCodec, codec.OrjsonCodec, codec.MsgpackCodec):
+            self.assertTrue(cls.__doc__, "{} needs a docstring".format(cls))
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(func.__doc__,
+                                "{:s} method needs a docstring".format(name))
+
+
+class TestCodec(unittest.TestCase):
+    """Test encoding and decoding with each installed codec"""
+    data = {"State.1": {"id": "1", "name": "Lagos", "__class__": "State",
+                        "created_at": "2017-06-14T22:31:03.285259"},
+            "Place.2": {"id": "2", "amenity_ids": ["a", "b"],
+                        "latitude": 6.5, "number_rooms": 3}}
+
+    def test_round_trip(self):
+        """test that every codec decodes what it encodes"""
+        self.assertIn("json", codec.codecs)
+        for name, c in codec.codecs.items():
+            with self.subTest(codec=name):
+                self.assertEqual(codec.decode(c.encode(self.data)), self.data)
+
+    def test_plain_json(self):
+        """test that JSON is written without a header and read as is"""
+        for name in ("json", "orjson"):
+            with self.subTest(codec=name):
+                encoded = codec.get(name).encode(self.data)
+                self.assertEqual(json.loads(encoded), self.data)
+        self.assertEqual(codec.decode(json.dumps(self.data).encode()),
+                         self.data)
+
+    def test_fallback(self):
+        """test that unknown codecs fall back to json"""
+        self.assertIs(codec.get("yaml"), codec.codecs["json"])
+        self.assertIs(codec.get(""), codec.codecs["json"])
+        with self.assertRaises(ValueError):
+            codec.decode(b"%HBNB yaml\n{}")
+
+    @unittest.skipIf(codec.msgpack is None, "msgpack is not installed")
+    def test_msgpack_header(self):
+        """test that msgpack files start with their header"""
+        encoded = codec.get("msgpack").encode(self.data)
+        self.assertTrue(encoded.startswith(b"%HBNB msgpack\n"))
+
+    def test_nan(self):
+        """test that NaN and Infinity written by json are read back"""
+        data = {"State.1": {"rank": float("nan"), "size": float("inf")}}
+        decoded = codec.decode(codec.get("json").encode(data))
+        self.assertNotEqual(decoded["State.1"]["rank"],
+                            decoded["State.1"]["rank"])
+        self.assertEqual(decoded["State.1"]["size"], float("inf"))
+        self.assertEqual(codec.JSON.loads(b'{"a": NaN}').keys(), {"a"})
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnStoreDocs and TestColumnStore classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.engine import column_store
+from models.place import Place
+from models.state import State
+import pep8
+import unittest
+ColumnStore = column_store.ColumnStore
+
+
+class TestColumnStoreDocs(unittest.TestCase):
+    """Tests to check the documentation and style of column_store.py"""
+
+    def test_pep8_conformance(self):
+        """Test that column_store.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/column_store.py',
+            'tests/test_models/test_engine/test_column_store.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_module_docstring(self):
+        """Test for the column_store.py module docstring"""
+        self.assertIsNot(column_store.__doc__, None,
+                         "column_store.py needs a docstring")
+        self.assertTrue(len(column_store.__doc__) >= 1,
+                        "column_store.py needs a docstring")
+
+    def test_docstrings(self):
+        """Test for the presence of docstrings in the classes and methods"""
+        for cls in (column_store.Column, column_store.TimeColumn,
+                    column_store.CompactModel, ColumnStore):
+            self.assertTrue(cls.__doc__, "{} needs a docstring".format(cls))
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(func.__doc__,
+                                "{:s} method needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestColumnStore(unittest.TestCase):
+    """Test the proxies handed out by ColumnStore"""
+
+    def setUp(self):
+        """builds a Place and its compact copy"""
+        self.store = ColumnStore(Place)
+        self.place = Place(name="Hut", city_id="c1", user_id="u1",
+                           amenity_ids=["a1"], rating=4)
+        self.proxy = self.store.add(self.place.to_dict())
+
+    def test_proxy_is_a_model(self):
+        """test that a proxy passes for an instance of its model class"""
+        self.assertIsInstance(self.proxy, Place)
+        self.assertEqual(self.proxy.__class__.__name__, "Place")
+        self.assertEqual(self.proxy.to_dict(), self.place.to_dict())
+        self.assertEqual(self.store.attributes(self.proxy),
+                         self.place.__dict__)
+        self.assertEqual(str(self.proxy), "[Place] ({}) {}".format(
+            self.place.id, self.store.attributes(self.proxy)))
+        self.assertEqual(self.proxy.created_at, self.place.created_at)
+        self.assertIs(type(self.proxy.created_at), datetime)
+        self.assertEqual(self.proxy.description, "")
+        self.assertEqual(self.proxy.rating, 4)
+        with self.assertRaises(AttributeError):
+            self.proxy.missing
+
+    def test_set_attributes(self):
+        """test that attributes are read back from the columns"""
+        self.proxy.name = "Villa"
+        self.proxy.description = "big"
+        self.proxy.rating = 5
+        self.proxy.nickname = "V"
+        other = self.store.add(Place(name="Shed").to_dict())
+        d = self.proxy.to_dict()
+        self.assertEqual(d["name"], "Villa")
+        self.assertEqual(d["description"], "big")
+        self.assertEqual((d["rating"], d["nickname"]), (5, "V"))
+        self.assertEqual(other.name, "Shed")
+        self.assertNotIn("nickname", other.to_dict())
+        del self.proxy.description
+        self.assertEqual(self.proxy.description, "")
+        self.assertNotIn("description", self.proxy.to_dict())
+        self.assertEqual(self.proxy.__dict__, {})
+
+    def test_compact_columns(self):
+        """test that times are packed and foreign keys shared"""
+        columns = self.store.columns
+        self.assertEqual(columns["created_at"].values.typecode, "q")
+        other = self.store.add(Place(city_id="".join(["c", "1"])).to_dict())
+        self.assertIs(other.city_id, self.proxy.city_id)
+        self.store.assign(other, State(name="x").to_dict())
+        self.assertEqual(other.city_id, "")
+        self.assertEqual(other.name, "x")
+        self.assertEqual(self.store.key(other), "Place." + other.id)
+
+    def test_number_columns(self):
+        """test that numbers are packed and other values kept aside"""
+        columns = self.store.columns
+        self.assertEqual(columns["number_rooms"].values.typecode, "q")
+        self.assertEqual(columns["latitude"].values.typecode, "d")
+        self.proxy.number_rooms = 3
+        self.proxy.latitude = float("-inf")
+        self.proxy.max_guest = "4"
+        self.assertEqual(self.proxy.number_rooms, 3)
+        self.assertEqual(self.proxy.latitude, float("-inf"))
+        self.assertEqual(self.proxy.max_guest, "4")
+        self.assertEqual(self.proxy.price_by_night, 0)
+        self.assertNotIn("price_by_night", self.proxy.to_dict())
+
+    def test_release_reuses_rows(self):
+        """test that the row of a released proxy is only reused once the
+        proxy is gone, and then holds nothing of it"""
+        self.proxy.nickname = "V"
+        self.proxy.latitude = "north"
+        kept = self.store.add(Place(name="Shed").to_dict())
+        row = self.proxy._compact_row
+        self.store.release(self.proxy)
+        self.store.release(self.proxy)
+        self.assertEqual(self.proxy.to_dict(), self.place.to_dict() | {
+            "nickname": "V", "latitude": "north"})
+        other = self.store.add(Place(name="Hut").to_dict())
+        self.assertNotEqual(other._compact_row, row)
+        self.assertEqual(self.store.rows, 3)
+        del self.proxy
+        self.assertEqual(self.store.free, [row])
+        self.assertNotIn(row, self.store.extras)
+        self.assertNotIn(row, self.store.columns["latitude"].others)
+        reused = self.store.add(Place(name="Barn").to_dict())
+        self.assertEqual(reused._compact_row, row)
+        self.assertEqual(self.store.rows, 3)
+        self.assertEqual(reused.name, "Barn")
+        self.assertEqual(reused.latitude, 0.0)
+        self.assertNotIn("nickname", reused.to_dict())
+        self.assertEqual(self.store.key(reused), "Place." + reused.id)
+        self.assertEqual((kept.name, other.name), ("Shed", "Hut"))
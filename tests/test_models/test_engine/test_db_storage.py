@@ -17,7 +17,11 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import inspect as inspect_db, select
+import tempfile
 import unittest
+from unittest import mock
+from tests.isolation import isolate
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -89,6 +93,7 @@ class TestFileStorage(unittest.TestCase):
 
     def test_get(self):
         """test that get returns an object of a given class by id."""
+        isolate(self)
         storage = models.storage
         obj = State(name='Michigan')
         obj.save()
@@ -108,6 +113,7 @@ class TestFileStorage(unittest.TestCase):
 
     def test_count(self):
         """test that count returns the number of objects of a given class."""
+        isolate(self)
         storage = models.storage
         self.assertIs(type(storage.count()), int)
         self.assertIs(type(storage.count(None)), int)
@@ -124,3 +130,239 @@ class TestFileStorage(unittest.TestCase):
         self.assertGreater(storage.count(), storage.count(State))
         with self.assertRaises(TypeError):
             storage.count(State, 'op')
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_does_not_load_rows(self):
+        """test that count runs a COUNT query instead of loading all rows"""
+        storage = models.storage
+        State(name='Kogi').save()
+        expected = len(storage.all(State))
+        with mock.patch.object(DBStorage, "all", side_effect=AssertionError):
+            self.assertEqual(storage.count(State), expected)
+            self.assertEqual(storage.count("State"), expected)
+            self.assertEqual(storage.count(int), 0)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_batch(self):
+        """test that a batch commits once, and rolls back if it raises"""
+        storage = models.storage
+        session = storage._DBStorage__session
+        with mock.patch.object(session, "commit",
+                               side_effect=session.commit) as commit:
+            with storage.batch():
+                kept = State(name='Osun')
+                kept.save()
+                with storage.batch():
+                    City(name='Osogbo', state_id=kept.id).save()
+                self.assertEqual(commit.call_count, 0)
+            self.assertEqual(commit.call_count, 1)
+        self.assertEqual(len(kept.cities), 1)
+        count = storage.count(State)
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                State(name='Ogun').save()
+                kept.name = 'Oyo'
+                kept.save()
+                raise ValueError
+        self.assertEqual(storage.count(State), count)
+        self.assertEqual(storage.get(State, kept.id).name, 'Osun')
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_generation(self):
+        """test that the generation of a class follows every change to its
+        rows, even within one second and from another storage"""
+        storage = models.storage
+        state = State(name='Osun')
+        state.save()
+        seen = {storage.generation(State)}
+        city = storage.generation(City)
+        for name in ('Ogun', 'Oyo'):
+            state.name = name
+            state.save()
+            self.assertNotIn(storage.generation("State"), seen)
+            seen.add(storage.generation(State))
+        self.assertEqual(storage.generation(City), city)
+        other = DBStorage(storage._DBStorage__engine.url)
+        other.reload()
+        self.assertIn(other.generation(State), seen)
+        other.delete(other.get(State, state.id))
+        other.save()
+        other.close()
+        storage.close()
+        self.assertNotIn(storage.generation(State), seen)
+        seen.add(storage.generation(State))
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                State(name='Edo').save()
+                raise ValueError
+        self.assertIn(storage.generation(State), seen)
+        storage.bulk_new([State(name='Kano')])
+        storage.save()
+        self.assertNotIn(storage.generation(State), seen)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_generation_bumped_at_commit(self):
+        """test that a transaction bumps the generations of the classes it
+        changed once, with its last statement"""
+        storage = models.storage
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement.split()[0:2])
+        state = State(name='Osun')
+        state.save()
+        city = storage.generation(City)
+        db_storage.event.listen(engine, "before_cursor_execute", record)
+        try:
+            with storage.batch():
+                Amenity(name='Wifi').save()
+                state.name = 'Oyo'
+                state.save()
+                storage.get(State, state.id)
+                City(name='Osogbo', state_id=state.id).save()
+        finally:
+            db_storage.event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(statements.count(["UPDATE", "generations"]), 1)
+        self.assertEqual(statements[-1], ["UPDATE", "generations"])
+        self.assertNotEqual(storage.generation(City), city)
+
+
+class TestDBStorageEngine(unittest.TestCase):
+    """Test how DBStorage sets up its engine from the environment"""
+
+    def make_storage(self, **env):
+        """returns a DBStorage built with only env as HBNB_ settings"""
+        clean = {k: v for k, v in os.environ.items()
+                 if not k.startswith("HBNB_")}
+        clean.update(env)
+        with mock.patch.dict(os.environ, clean, clear=True):
+            return DBStorage()
+
+    def test_pool_settings(self):
+        """test that HBNB_MYSQL_POOL_* variables configure the pool"""
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = self.make_storage(
+                HBNB_MYSQL_URL="sqlite:///" + os.path.join(tmp, "hbnb.db"),
+                HBNB_MYSQL_POOL_SIZE="3", HBNB_MYSQL_MAX_OVERFLOW="2",
+                HBNB_MYSQL_POOL_TIMEOUT="4.5", HBNB_MYSQL_POOL_RECYCLE="60")
+            pool = storage._DBStorage__engine.pool
+            self.assertIsInstance(pool, db_storage.TimedQueuePool)
+            self.assertEqual(pool.size(), 3)
+            self.assertEqual(pool.timeout(), 4.5)
+            self.assertEqual(pool._max_overflow, 2)
+            self.assertEqual(pool._recycle, 60)
+            self.assertTrue(pool._pre_ping)
+            storage._DBStorage__engine.dispose()
+
+    def test_pool_metrics(self):
+        """test that pool_stats reports checkouts and their wait times"""
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = self.make_storage(
+                HBNB_MYSQL_URL="sqlite:///" + os.path.join(tmp, "hbnb.db"),
+                HBNB_MYSQL_POOL_PRE_PING="0")
+            engine = storage._DBStorage__engine
+            self.assertFalse(engine.pool._pre_ping)
+            self.assertEqual(storage.pool_stats()["checkouts"], 0)
+            with engine.connect():
+                stats = storage.pool_stats()
+                self.assertEqual(stats["checkedout"], 1)
+            stats = storage.pool_stats()
+            self.assertEqual(stats["checkouts"], 1)
+            self.assertEqual(stats["checkedout"], 0)
+            self.assertGreaterEqual(stats["wait_max"], 0)
+            self.assertGreaterEqual(stats["wait_total"], stats["wait_max"])
+            engine.dispose()
+
+    def test_in_memory_sqlite(self):
+        """test that an in-memory SQLite database keeps its own pool"""
+        storage = self.make_storage(HBNB_MYSQL_URL="sqlite://")
+        pool = storage._DBStorage__engine.pool
+        self.assertNotIsInstance(pool, db_storage.TimedQueuePool)
+        self.assertIn("status", storage.pool_stats())
+
+
+class TestDBStorageIndexes(unittest.TestCase):
+    """Test the indexes of the foreign keys and filtered columns"""
+    indexes = {"cities": ["ix_cities_state_id"],
+               "places": ["ix_places_city_id", "ix_places_user_id",
+                          "ix_places_max_guest", "ix_places_price_by_night"],
+               "place_amenity": ["ix_place_amenity_amenity_id"],
+               "reviews": ["ix_reviews_place_id", "ix_reviews_user_id"],
+               "users": ["ix_users_email"]}
+
+    def index_names(self, engine, table):
+        """returns the names of the indexes of table"""
+        return {index["name"]
+                for index in inspect_db(engine).get_indexes(table)}
+
+    def plan(self, query):
+        """returns the plan of the select query, from EXPLAIN QUERY PLAN
+        on SQLite and EXPLAIN on MySQL, as one string"""
+        engine = models.storage._DBStorage__engine
+        sql = str(query.compile(engine,
+                                compile_kwargs={"literal_binds": True}))
+        with engine.connect() as conn:
+            if engine.dialect.name == 'sqlite':
+                rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)
+                return "\n".join(row[-1] for row in rows)
+            rows = conn.exec_driver_sql("EXPLAIN " + sql)
+            return "\n".join("{} {}".format(row._mapping["possible_keys"],
+                                            row._mapping["key"])
+                             for row in rows)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_migration(self):
+        """test that reload adds the indexes an existing database lacks"""
+        with tempfile.TemporaryDirectory() as tmp:
+            url = "sqlite:///" + os.path.join(tmp, "hbnb.db")
+            with mock.patch.dict(os.environ, {"HBNB_ENV": ""}):
+                storage = DBStorage(url)
+                storage.reload()
+                engine = storage._DBStorage__engine
+                for table, names in self.indexes.items():
+                    self.assertLessEqual(set(names),
+                                         self.index_names(engine, table))
+                with engine.begin() as conn:
+                    conn.exec_driver_sql("DROP INDEX ix_cities_state_id")
+                    conn.exec_driver_sql("DROP INDEX ix_users_email")
+                engine.dispose()
+                storage = DBStorage(url)
+                storage.reload()
+                engine = storage._DBStorage__engine
+                self.assertIn("ix_cities_state_id",
+                              self.index_names(engine, "cities"))
+                self.assertIn("ix_users_email",
+                              self.index_names(engine, "users"))
+                engine.dispose()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_explain(self):
+        """test that the relationship and search queries use the indexes"""
+        from models.place import place_amenity
+        queries = {
+            "ix_cities_state_id": select(City).where(City.state_id == "s"),
+            "ix_places_city_id": select(Place).where(Place.city_id == "c"),
+            "ix_places_user_id": select(Place).where(Place.user_id == "u"),
+            "ix_reviews_place_id": select(Review).where(
+                Review.place_id == "p"),
+            "ix_reviews_user_id": select(Review).where(
+                Review.user_id == "u"),
+            "ix_users_email": select(User).where(User.email == "a@b.c"),
+            "ix_places_price_by_night": select(Place).where(
+                Place.price_by_night == 100),
+            "ix_places_max_guest": select(Place).where(
+                Place.max_guest == 4),
+            "ix_place_amenity_amenity_id": select(
+                place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(["a", "b"])),
+        }
+        for name, query in queries.items():
+            with self.subTest(index=name):
+                self.assertIn(name, self.plan(query))
+        search = select(Place).join(City, Place.city_id == City.id).where(
+            City.state_id.in_(["s"]))
+        plan = self.plan(search)
+        self.assertIn("ix_cities_state_id", plan)
+        self.assertIn("ix_places_city_id", plan)
@@ -6,7 +6,7 @@ Contains the TestFileStorageDocs classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import codec, file_storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -15,9 +15,12 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
 import unittest
+from unittest import mock
+from tests.isolation import isolate, isolated
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -45,6 +48,13 @@ test_file_storage.py'])
         self.assertEqual(result.total_errors, 0,
                          "Found code style errors (and warnings).")
 
+    def test_pep8_conformance_isolation(self):
+        """Test that tests/isolation.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/isolation.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
     def test_file_storage_module_docstring(self):
         """Test for the file_storage.py module docstring"""
         self.assertIsNot(file_storage.__doc__, None,
@@ -82,17 +92,17 @@ class TestFileStorage(unittest.TestCase):
     def test_new(self):
         """test that new adds an object to the FileStorage.__objects attr"""
         storage = FileStorage()
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = {}
-        test_dict = {}
-        for key, value in classes.items():
-            with self.subTest(key=key, value=value):
-                instance = value()
-                instance_key = instance.__class__.__name__ + "." + instance.id
-                storage.new(instance)
-                test_dict[instance_key] = instance
-                self.assertEqual(test_dict, storage._FileStorage__objects)
-        FileStorage._FileStorage__objects = save
+        with isolated():
+            test_dict = {}
+            for key, value in classes.items():
+                with self.subTest(key=key, value=value):
+                    instance = value()
+                    instance_key = (instance.__class__.__name__ + "." +
+                                    instance.id)
+                    storage.new(instance)
+                    test_dict[instance_key] = instance
+                    self.assertEqual(test_dict,
+                                     storage._FileStorage__objects)
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_save(self):
@@ -103,19 +113,18 @@ class TestFileStorage(unittest.TestCase):
             instance = value()
             instance_key = instance.__class__.__name__ + "." + instance.id
             new_dict[instance_key] = instance
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = new_dict
-        storage.save()
-        FileStorage._FileStorage__objects = save
-        for key, value in new_dict.items():
-            new_dict[key] = value.to_dict()
-        string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
-            js = f.read()
+        with isolated(objects=new_dict) as path:
+            storage.save()
+            for key, value in new_dict.items():
+                new_dict[key] = value.to_dict()
+            string = json.dumps(new_dict)
+            with open(path, "r") as f:
+                js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
 
     def test_get(self):
         """test that get returns an object of a given class by id."""
+        isolate(self)
         storage = models.storage
         obj = State(name='Michigan')
         obj.save()
@@ -135,6 +144,7 @@ class TestFileStorage(unittest.TestCase):
 
     def test_count(self):
         """test that count returns the number of objects of a given class."""
+        isolate(self)
         storage = models.storage
         self.assertIs(type(storage.count()), int)
         self.assertIs(type(storage.count(None)), int)
@@ -151,3 +161,607 @@ class TestFileStorage(unittest.TestCase):
         self.assertGreater(storage.count(), storage.count(State))
         with self.assertRaises(TypeError):
             storage.count(State, 'op')
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_does_not_scan(self):
+        """test that get looks the object up by key instead of scanning"""
+        class NoScan(dict):
+            """dict that fails the test when iterated"""
+            def values(self):
+                raise AssertionError("get() scanned __objects")
+            items = keys = __iter__ = values
+
+        storage = FileStorage()
+        obj = State(name='Kano')
+        with isolated(objects=NoScan({"State." + obj.id: obj})):
+            self.assertIs(storage.get(State, obj.id), obj)
+            self.assertIsNone(storage.get(City, obj.id))
+            self.assertIsNone(storage.get("State", obj.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_class_index_in_sync(self):
+        """test that all(cls) follows new, delete and a replaced __objects"""
+        storage = FileStorage()
+        with isolated():
+            state = State(name='Oyo')
+            city = City(name='Ibadan')
+            storage.new(state)
+            storage.new(city)
+            self.assertEqual(list(storage.all(State).values()), [state])
+            self.assertEqual(list(storage.all("City").values()), [city])
+            storage.delete(state)
+            self.assertEqual(storage.all(State), {})
+            self.assertEqual(storage.count(City), 1)
+            FileStorage._FileStorage__objects = {"State." + state.id: state}
+            self.assertEqual(list(storage.all(State).values()), [state])
+            self.assertEqual(storage.all(City), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_skips_unchanged_file(self):
+        """test that close only reparses the JSON file when it changed"""
+        storage = FileStorage()
+        with isolated() as path:
+            State(name='Kaduna').save()
+            with mock.patch.object(file_storage.codec, "decode",
+                                   wraps=codec.decode) as load:
+                storage.close()
+                storage.close()
+                self.assertEqual(load.call_count, 0)
+                state = State(name='Delta')
+                with open(path) as f:
+                    js = json.loads(f.read())
+                js["State." + state.id] = state.to_dict()
+                with open(path, "w") as f:
+                    f.write(json.dumps(js))
+                storage.close()
+                self.assertEqual(load.call_count, 1)
+                storage.close()
+                self.assertEqual(load.call_count, 1)
+            self.assertEqual(storage.get(State, state.id).name, 'Delta')
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """test that journal mode appends changes and reload replays them"""
+        storage = FileStorage()
+        with isolated(journal=True) as path:
+            kept, gone = State(name='Abia'), State(name='Imo')
+            storage.new(kept)
+            storage.new(gone)
+            storage.save()
+            self.assertFalse(os.path.exists(path))
+            kept.name = 'Anambra'
+            kept.save()
+            storage.delete(gone)
+            storage.save()
+            with open(path + ".journal") as f:
+                self.assertEqual(len(f.readlines()), 4)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, kept.id).name, 'Anambra')
+            self.assertIsNone(storage.get(State, gone.id))
+            FileStorage._FileStorage__journal_max = 4
+            City(name='Aba').save()
+            self.assertFalse(os.path.exists(path + ".journal"))
+            with open(path) as f:
+                self.assertEqual(len(json.loads(f.read())), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_does_not_build_dicts(self):
+        """test that count reads the class index instead of calling all"""
+        storage = models.storage
+        isolate(self)
+        State(name='Benue').save()
+        expected = len(storage.all(State))
+        total = len(storage.all())
+        with mock.patch.object(FileStorage, "all", side_effect=AssertionError):
+            self.assertEqual(storage.count(State), expected)
+            self.assertEqual(storage.count("State"), expected)
+            self.assertEqual(storage.count(), total)
+            self.assertEqual(storage.count(int), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_relationships_use_reverse_index(self):
+        """test that relationship getters read the foreign key indexes"""
+        storage = FileStorage()
+        with isolated():
+            state, other = State(name='Edo'), State(name='Ekiti')
+            city = City(name='Benin', state_id=state.id)
+            user = User(email='a@b.c', password='pwd')
+            place = Place(name='Hut', city_id=city.id, user_id=user.id)
+            review = Review(text='ok', place_id=place.id, user_id=user.id)
+            for obj in (state, other, city, user, place, review):
+                storage.new(obj)
+            with mock.patch.object(FileStorage, "all",
+                                   side_effect=AssertionError):
+                self.assertEqual(state.cities, [city])
+                self.assertEqual(other.cities, [])
+                self.assertEqual(city.places, [place])
+                self.assertEqual(place.reviews, [review])
+                self.assertEqual(user.places, [place])
+                self.assertEqual(user.reviews, [review])
+                city.state_id = other.id
+                storage.new(city)
+                self.assertEqual(state.cities, [])
+                self.assertEqual(other.cities, [city])
+                storage.delete(review)
+                self.assertEqual(place.reviews, [])
+            city.state_id = state.id
+            storage.save()
+            self.assertEqual(state.cities, [city])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """test that page walks a class in id order across changes"""
+        storage = FileStorage()
+        with isolated():
+            states = [State(name=str(i)) for i in range(5)]
+            for state in states:
+                storage.new(state)
+            states.sort(key=lambda state: state.id)
+            self.assertEqual(storage.page(State, 2), states[:2])
+            self.assertEqual(storage.page("State", 2, states[1].id),
+                             states[2:4])
+            storage.delete(states.pop(2))
+            extra = State(name='extra')
+            storage.new(extra)
+            states = sorted(states + [extra], key=lambda state: state.id)
+            self.assertEqual(storage.page(State, 10), states)
+            self.assertEqual(storage.page(State, 10, states[-1].id), [])
+            self.assertEqual(storage.page(City, 10), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_after_concurrent_delete(self):
+        """test that keys deleted after page took its slice do not cut the
+        page, or iterate, short"""
+        storage = FileStorage()
+        with isolated():
+            states = [State(name=str(i)) for i in range(600)]
+            for state in states:
+                storage.new(state)
+            states.sort(key=lambda state: state.id)
+            self.assertEqual(storage.page(State, 1), states[:1])
+            # gone from the index, as by a delete between the slice and
+            # the lookups, but still in the ordered keys
+            by_class = FileStorage._FileStorage__by_class["State"]
+            for state in states[1:500:50]:
+                del by_class["State." + state.id]
+            kept = [state for state in states
+                    if "State." + state.id in by_class]
+            self.assertEqual(storage.page(State, 3), kept[:3])
+            self.assertEqual(storage.page(State, 3, kept[0].id), kept[1:4])
+            self.assertEqual(list(storage.iterate(State)), kept)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_reload(self):
+        """test that compact mode reloads objects into column stores"""
+        storage = FileStorage()
+        with isolated() as path:
+            state = State(name='Oyo')
+            city = City(name='Ibadan', state_id=state.id)
+            for obj in (state, city):
+                storage.new(obj)
+            storage.save()
+            FileStorage._FileStorage__compact = True
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            loaded = storage.get(State, state.id)
+            self.assertIsNot(type(loaded), State)
+            self.assertIsInstance(loaded, State)
+            self.assertEqual(loaded.to_dict(), state.to_dict())
+            self.assertEqual(storage.all(City)["City." + city.id].name,
+                             'Ibadan')
+            self.assertEqual([c.id for c in loaded.cities], [city.id])
+            loaded.name = 'Osun'
+            loaded.save()
+            storage.reload()
+            self.assertIs(storage.get(State, state.id), loaded)
+            with open(path) as f:
+                saved = json.loads(f.read())
+            self.assertEqual(saved["State." + state.id]["name"], 'Osun')
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_delete_reuses_rows(self):
+        """test that compact mode reuses the rows of deleted objects"""
+        storage = FileStorage()
+        with isolated(compact=True, lazy=False):
+            ids = []
+            for name in ('Oyo', 'Osun', 'Ogun'):
+                state = State(name=name)
+                storage.new(state)
+                ids.append(state.id)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            store = FileStorage._FileStorage__stores["State"]
+            self.assertEqual(store.rows, 3)
+            for state_id in ids:
+                storage.delete(storage.get(State, state_id))
+            storage.save()
+            self.assertEqual(len(store.free), 3)
+            for name in ('Edo', 'Kano'):
+                storage.new(State(name=name))
+            storage.save()
+            storage.reload()
+            self.assertEqual(store.rows, 3)
+            self.assertEqual(len(store.free), 1)
+            self.assertEqual(sorted(state.name for state in
+                                    storage.all(State).values()),
+                             ['Edo', 'Kano'])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_codec_migration(self):
+        """test that reload detects the format a file was written in"""
+        storage = FileStorage()
+        with isolated() as path:
+            state = State(name='Kano')
+            storage.new(state)
+            storage.save()
+            for name in codec.codecs:
+                FileStorage._FileStorage__codec = codec.get(name)
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual(storage.get(State, state.id).name, 'Kano')
+                storage.save()
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if name == "msgpack":
+                    self.assertTrue(data.startswith(b"%HBNB msgpack\n"))
+                else:
+                    self.assertEqual(json.loads(data),
+                                     {"State." + state.id: state.to_dict()})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_atomic_save(self):
+        """test that a failed save leaves the previous file whole"""
+        storage = FileStorage()
+        with isolated() as path:
+            State(name='Kwara').save()
+            with open(path) as f:
+                before = f.read()
+            storage.new(State(name='Borno'))
+            with mock.patch.object(file_storage.os, "fsync",
+                                   side_effect=OSError):
+                with self.assertRaises(OSError):
+                    storage.save()
+            with open(path) as f:
+                self.assertEqual(f.read(), before)
+            self.assertEqual([name for name in
+                              os.listdir(os.path.dirname(path))
+                              if name.endswith(".tmp")], [])
+            storage.save()
+            with open(path) as f:
+                self.assertEqual(len(json.loads(f.read())), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_delay(self):
+        """test that the saves made within the delay are written once"""
+        storage = FileStorage()
+        with isolated(save_delay=60) as path:
+            write = FileStorage._FileStorage__write_file
+            with mock.patch.object(FileStorage, "_FileStorage__write_file",
+                                   autospec=True,
+                                   side_effect=write) as written:
+                states = [State(name=str(i)) for i in range(5)]
+                for state in states:
+                    state.save()
+                self.assertFalse(os.path.exists(path))
+                storage.flush()
+                storage.flush()
+                self.assertEqual(written.call_count, 1)
+            with open(path) as f:
+                self.assertEqual(len(json.loads(f.read())), 5)
+            FileStorage._FileStorage__save_delay = 0.2
+            State(name='late').save()
+            FileStorage._FileStorage__timer.join()
+            with open(path) as f:
+                self.assertEqual(len(json.loads(f.read())), 6)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch(self):
+        """test that a batch writes once, and rolls back if it raises"""
+        storage = FileStorage()
+        with isolated() as path:
+            write = FileStorage._FileStorage__write_file
+            kept = State(name='Osun')
+            kept.save()
+            gone = State(name='Ekiti')
+            gone.save()
+            pending = State(name='Kogi')
+            storage.new(pending)
+            with mock.patch.object(FileStorage, "_FileStorage__write_file",
+                                   autospec=True,
+                                   side_effect=write) as written:
+                with storage.batch():
+                    for i in range(5):
+                        State(name=str(i)).save()
+                    with storage.batch():
+                        gone.delete()
+                        storage.save()
+                    self.assertEqual(written.call_count, 0)
+                self.assertEqual(written.call_count, 1)
+            with open(path) as f:
+                self.assertEqual(len(json.loads(f.read())), 7)
+            edo = State(name='Edo')
+            storage.new(edo)
+            with self.assertRaises(ValueError):
+                with storage.batch():
+                    State(name='Ogun').save()
+                    kept.name = 'Oyo'
+                    kept.save()
+                    pending.delete()
+                    edo.delete()
+                    raise ValueError
+            self.assertEqual(storage.count(State), 8)
+            self.assertEqual(storage.get(State, kept.id).name, 'Osun')
+            self.assertEqual(storage.get(State, pending.id).name, 'Kogi')
+            self.assertIs(storage.get(State, edo.id), edo)
+            self.assertEqual(list(FileStorage._FileStorage__dirty),
+                             ["State." + edo.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_generation(self):
+        """test that the generation of a class follows its changes only"""
+        storage = FileStorage()
+        with isolated():
+            state = State(name='Osun')
+            first = storage.generation(State)
+            storage.new(state)
+            second = storage.generation("State")
+            self.assertNotEqual(first, second)
+            storage.new(City(name='Osogbo', state_id=state.id))
+            self.assertEqual(storage.generation(State), second)
+            storage.delete(state)
+            self.assertNotIn(storage.generation(State), (first, second))
+            FileStorage._FileStorage__objects = {}
+            self.assertNotIn(storage.generation(State), (first, second))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_nan_and_corrupt_file(self):
+        """test that NaN is read back, lazily or not, and that a file that
+        cannot be decoded raises instead of being read as empty"""
+        storage = FileStorage()
+        for lazy in (True, False):
+            with isolated(lazy=lazy, codec=codec.get("json")):
+                state = State(name='Osun', rank=float('nan'))
+                storage.new(state)
+                storage.save()
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual(storage.count(State), 1)
+                rank = storage.get(State, state.id).rank
+                self.assertNotEqual(rank, rank)
+        with isolated() as path:
+            with open(path, "w") as f:
+                f.write('{"State.1": {')
+            with self.assertRaises(ValueError):
+                storage.reload()
+            with open(path) as f:
+                self.assertEqual(f.read(), '{"State.1": {')
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_creates_no_lock_file(self):
+        """test that only a write creates the lock file, and that reload
+        goes on without it when it cannot be opened"""
+        storage = FileStorage()
+        with isolated() as path:
+            storage.reload()
+            storage.close()
+            self.assertEqual(os.listdir(os.path.dirname(path)), [])
+            State(name='Osun').save()
+            self.assertTrue(os.path.exists(path + ".lock"))
+
+            def no_lock_file(name, *args, **kwargs):
+                """fails to open the lock file, as in a read-only place"""
+                if name.endswith(".lock"):
+                    raise PermissionError(name)
+                return open(name, *args, **kwargs)
+            FileStorage._FileStorage__objects = {}
+            with mock.patch.object(file_storage, "open", no_lock_file,
+                                   create=True):
+                storage.reload()
+            self.assertEqual(storage.count(State), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """test that reload reads a class from the file when first used"""
+        storage = FileStorage()
+        with isolated(lazy=True, compact=False) as path:
+            state = State(name='Osun')
+            storage.new(state)
+            storage.new(City(name='Osogbo', state_id=state.id))
+            storage.new(Amenity(name='Wifi'))
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            self.assertEqual(storage.count(Amenity), 1)
+            self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+            storage.new(Amenity(name='Pool'))
+            storage.save()
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)), 4)
+            self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+            storage.new(City(name='Ede', state_id=state.id))
+            storage.save()
+            self.assertEqual(storage.get(State, state.id).name, 'Osun')
+            self.assertEqual(len(storage.all()), 5)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)), 5)
+            with open(path + ".journal", "w"):
+                pass
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(len(FileStorage._FileStorage__objects), 5)
+            os.remove(path + ".journal")
+            with open(path, "a") as f:
+                f.write(" ")
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(len(FileStorage._FileStorage__objects), 5)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_point_get(self):
+        """test that get reads one object of a class left in the file"""
+        storage = FileStorage()
+        with isolated(lazy=True, compact=False) as path:
+            states = [State(name='Osun'), State(name='Oyo')]
+            for state in states:
+                storage.new(state)
+            storage.new(Amenity(name='Wifi'))
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            loaded = storage.get(State, states[0].id)
+            self.assertEqual(loaded.to_dict(), states[0].to_dict())
+            self.assertIs(storage.get(State, states[0].id), loaded)
+            self.assertIsNone(storage.get(State, "missing"))
+            self.assertIsNone(storage.get(Amenity, states[0].id))
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            storage.new(Amenity(name='Pool'))
+            storage.save()
+            self.assertEqual(storage.get(State, states[1].id).name, 'Oyo')
+            loaded.name = 'Ogun'
+            loaded.save()
+            self.assertEqual(storage.count(State), 2)
+            self.assertIs(storage.get(State, states[0].id), loaded)
+            os.remove(path + ".ids")
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, states[0].id).name, 'Ogun')
+            self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+
+    @unittest.skipIf(models.storage_t == 'db' or file_storage.fcntl is None,
+                     "not testing file storage with fcntl")
+    def test_lazy_delete(self):
+        """test that an object deleted from a class read when first used
+        stays deleted, whether or not another process saved meanwhile"""
+        fork = multiprocessing.get_context("fork")
+        storage = FileStorage()
+        for other in (False, True):
+            with isolated(lazy=True, compact=False, journal=False) as path:
+                state = State(name='Osun')
+                storage.new(state)
+                storage.new(Amenity(name='Wifi'))
+                storage.save()
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                # the other process starts before the delete, not to save it
+                go = fork.Event()
+                proc = fork.Process(target=self.write_amenity, args=(go,))
+                if other:
+                    proc.start()
+                storage.delete(storage.get(State, state.id))
+                self.assertEqual(storage.count(State), 0)
+                if other:
+                    go.set()
+                    proc.join()
+                    self.assertEqual(proc.exitcode, 0)
+                storage.save()
+                self.assertEqual(storage.count(State), 0)
+                self.assertEqual(storage.count(Amenity), 1 + other)
+                with open(path) as f:
+                    self.assertNotIn("State." + state.id, json.load(f))
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual(storage.count(State), 0)
+                self.assertEqual(storage.count(Amenity), 1 + other)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_rollback(self):
+        """test that a failed batch puts back an object it deleted from a
+        class read when first used"""
+        storage = FileStorage()
+        with isolated(lazy=True, compact=False):
+            state = State(name='Osun')
+            storage.new(state)
+            storage.new(Amenity(name='Wifi'))
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            with self.assertRaises(RuntimeError):
+                with storage.batch():
+                    storage.delete(storage.get(State, state.id))
+                    storage.new(Amenity(name='Pool'))
+                    storage.save()
+                    raise RuntimeError
+            self.assertEqual(storage.get(State, state.id).name, 'Osun')
+            self.assertEqual(storage.count(Amenity), 1)
+            storage.new(City(name='Osogbo', state_id=state.id))
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.count(Amenity), 1)
+            self.assertEqual(storage.count(City), 1)
+
+    @staticmethod
+    def write_amenity(go):
+        """saves an amenity once go is set, run in another process"""
+        go.wait()
+        Amenity(name='Pool').save()
+
+    @staticmethod
+    def write_states(n):
+        """saves 10 states, run in another process"""
+        for i in range(10):
+            State(name="{}-{}".format(n, i)).save()
+
+    @staticmethod
+    def delete_state(state):
+        """deletes state and saves, run in another process"""
+        state.delete()
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db' or file_storage.fcntl is None,
+                     "not testing file storage with fcntl")
+    def test_processes_keep_each_other_writes(self):
+        """test that processes saving the same file lose no write"""
+        fork = multiprocessing.get_context("fork")
+        storage = FileStorage()
+        for journal in (False, True):
+            with isolated(journal=journal):
+                storage.save()
+                procs = [fork.Process(target=self.write_states,
+                                      args=(n,)) for n in range(4)]
+                for proc in procs:
+                    proc.start()
+                for proc in procs:
+                    proc.join()
+                    self.assertEqual(proc.exitcode, 0)
+                storage.close()
+                names = {state.name for state in
+                         storage.all(State).values()}
+                self.assertEqual(names, {"{}-{}".format(n, i)
+                                         for n in range(4)
+                                         for i in range(10)})
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual(storage.count(State), 40)
+
+    @unittest.skipIf(models.storage_t == 'db' or file_storage.fcntl is None,
+                     "not testing file storage with fcntl")
+    def test_journal_catch_up(self):
+        """test that the journal written by another process is replayed
+        without reading the whole file again"""
+        fork = multiprocessing.get_context("fork")
+        storage = FileStorage()
+        with isolated():
+            gone = State(name='gone')
+            storage.new(gone)
+            storage.save()
+            FileStorage._FileStorage__journal = True
+            State(name='mine').save()
+            proc = fork.Process(target=self.write_states, args=(9,))
+            proc.start()
+            proc.join()
+            with mock.patch.object(file_storage.codec, "decode",
+                                   wraps=codec.decode) as load:
+                storage.close()
+                self.assertEqual(load.call_count, 0)
+            self.assertEqual(storage.count(State), 12)
+            proc = fork.Process(target=self.delete_state, args=(gone,))
+            proc.start()
+            proc.join()
+            State(name='last').save()
+            self.assertIsNone(storage.get(State, gone.id))
+            self.assertEqual(storage.count(State), 12)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the TestRecordIndexDocs and TestRecordIndex classes
+"""
+
+import inspect
+import json
+import os
+from models.engine import record_index
+from models.engine.record_index import RecordIndex, digest
+import pep8
+import tempfile
+import unittest
+
+
+class TestRecordIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of record_index.py"""
+
+    def test_pep8_conformance(self):
+        """Test that record_index.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/record_index.py',
+            'tests/test_models/test_engine/test_record_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test for the presence of docstrings in the module"""
+        self.assertTrue(record_index.__doc__,
+                        "record_index.py needs a docstring")
+        self.assertTrue(RecordIndex.__doc__, "RecordIndex needs a docstring")
+        for name, func in inspect.getmembers(RecordIndex,
+                                             inspect.isfunction):
+            self.assertTrue(func.__doc__,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestRecordIndex(unittest.TestCase):
+    """Test writing an index and looking records up through it"""
+
+    def setUp(self):
+        """writes a JSON file of three records and its index"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "f.json")
+        self.index_path = self.path + ".ids"
+        pieces = [json.dumps({"State.{}".format(i): {"id": str(i)}})[1:-1]
+                  for i in range(3)]
+        records = []
+        offset = 1
+        for i, piece in enumerate(pieces):
+            records.append((digest("State.{}".format(i)), offset,
+                            offset + len(piece)))
+            offset += len(piece) + 1
+        with open(self.path, "w") as f:
+            f.write("{" + ",".join(pieces) + "}")
+        RecordIndex.write(self.index_path,
+                          record_index.stamp_of(os.stat(self.path)), records)
+
+    def tearDown(self):
+        """removes the files"""
+        self.tmp.cleanup()
+
+    def test_lookup(self):
+        """test that a record is read alone, and a missing key is None"""
+        index = RecordIndex.open(self.path, self.index_path)
+        self.assertIsNotNone(index)
+        try:
+            self.assertEqual(index.count, 3)
+            for i in range(3):
+                key = "State.{}".format(i)
+                raw = index.lookup(key)
+                self.assertEqual(json.loads(b"{" + raw + b"}"),
+                                 {key: {"id": str(i)}})
+            self.assertIsNone(index.lookup("State.3"))
+            self.assertEqual(len(index.records()), 3)
+        finally:
+            index.close()
+
+    def test_out_of_date(self):
+        """test that an index is not opened for another file"""
+        with open(self.path, "a") as f:
+            f.write(" ")
+        self.assertIsNone(RecordIndex.open(self.path, self.index_path))
+        os.remove(self.index_path)
+        self.assertIsNone(RecordIndex.open(self.path, self.index_path))
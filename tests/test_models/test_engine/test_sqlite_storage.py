@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+import os
+from models.engine import sqlite_storage
+from models.engine.sqlite_storage import SQLiteStorage
+import pep8
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+
+    def test_pep8_conformance(self):
+        """Test that sqlite_storage.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/sqlite_storage.py',
+            'tests/test_models/test_engine/test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test for the presence of docstrings in the module"""
+        self.assertTrue(sqlite_storage.__doc__,
+                        "sqlite_storage.py needs a docstring")
+        self.assertTrue(SQLiteStorage.__doc__,
+                        "SQLiteStorage class needs a docstring")
+        for name, func in inspect.getmembers(SQLiteStorage,
+                                             inspect.isfunction):
+            self.assertTrue(func.__doc__,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLite database SQLiteStorage sets up"""
+
+    def test_wal_mode(self):
+        """test that the file is opened in WAL mode with foreign keys"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "hbnb.db")
+            with mock.patch.dict(os.environ, {"HBNB_SQLITE_PATH": db_path}):
+                storage = SQLiteStorage()
+            engine = storage._DBStorage__engine
+            self.assertEqual(engine.url.database, db_path)
+            with engine.connect() as conn:
+                pragma = conn.exec_driver_sql
+                self.assertEqual(
+                    pragma("PRAGMA journal_mode").scalar(), "wal")
+                self.assertEqual(pragma("PRAGMA foreign_keys").scalar(), 1)
+            engine.dispose()
+
+    def test_selected(self):
+        """test that HBNB_TYPE_STORAGE=sqlite selects SQLiteStorage and the
+        database models"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {k: v for k, v in os.environ.items()
+                   if not k.startswith("HBNB_")}
+            env.update(HBNB_TYPE_STORAGE="sqlite",
+                       HBNB_SQLITE_PATH=os.path.join(tmp, "hbnb.db"))
+            code = ("import models\n"
+                    "from models.state import State\n"
+                    "State(name='Lagos').save()\n"
+                    "print(type(models.storage).__name__, models.storage_t,"
+                    " models.storage.count(State))")
+            out = subprocess.check_output([sys.executable, "-c", code],
+                                          env=env, universal_newlines=True)
+            self.assertEqual(out.split(), ["SQLiteStorage", "db", "1"])
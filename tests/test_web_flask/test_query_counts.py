@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryCounts class
+"""
+
+import importlib
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.state import State
+import pep8
+from sqlalchemy import event
+import unittest
+
+
+class TestQueryCountsDocs(unittest.TestCase):
+    """Tests to check the style of the query count tests"""
+
+    def test_pep8_conformance_test_query_counts(self):
+        """Test that tests/test_web_flask/test_query_counts.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_web_flask/\
+test_query_counts.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestQueryCounts(unittest.TestCase):
+    """Test that pages walking relationships run a fixed number of queries"""
+
+    def count_queries(self, fn):
+        """returns the number of SQL statements run by fn()"""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records one statement"""
+            statements.append(statement)
+
+        engine = models.storage._DBStorage__engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        return len(statements)
+
+    def add_states(self, n):
+        """adds n states with two cities each"""
+        for i in range(n):
+            state = State(name="state {}".format(i))
+            state.save()
+            for j in range(2):
+                City(name="city {}".format(j), state_id=state.id).save()
+        Amenity(name="Wifi").save()
+        models.storage.close()
+
+    def page_queries(self, module, url):
+        """returns the number of queries to render url with module's app"""
+        app = importlib.import_module("web_flask." + module).app
+        client = app.test_client()
+        return self.count_queries(lambda: client.get(url))
+
+    def test_all_with_eager_cities(self):
+        """test that eagerly loading cities costs one query per level"""
+        def walk():
+            """loads the states and touches all their cities"""
+            states = models.storage.all(State, eager={"cities": "selectin"})
+            for state in states.values():
+                state.cities
+        self.add_states(2)
+        few = self.count_queries(walk)
+        models.storage.close()
+        self.add_states(6)
+        self.assertEqual(self.count_queries(walk), few)
+        models.storage.close()
+
+    def test_get_with_eager_path(self):
+        """test that get accepts dotted eager paths and joined loading"""
+        self.add_states(1)
+        state = list(models.storage.all(State).values())[0]
+        models.storage.close()
+        queries = self.count_queries(lambda: [
+            city.places for city in models.storage.get(
+                State, state.id,
+                eager={"cities.places": "joined"}).cities])
+        self.assertEqual(queries, 1)
+        models.storage.close()
+
+    def test_cities_by_states_page(self):
+        """test that /cities_by_states does not query once per state"""
+        self.add_states(2)
+        few = self.page_queries("8-cities_by_states", "/cities_by_states")
+        self.add_states(6)
+        self.assertEqual(
+            self.page_queries("8-cities_by_states", "/cities_by_states"), few)
+
+    def test_hbnb_filters_page(self):
+        """test that /hbnb_filters does not query once per state"""
+        self.add_states(2)
+        few = self.page_queries("10-hbnb_filters", "/hbnb_filters")
+        self.add_states(6)
+        self.assertEqual(
+            self.page_queries("10-hbnb_filters", "/hbnb_filters"), few)